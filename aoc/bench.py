@@ -0,0 +1,119 @@
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+from aoc import runner
+from aoc.generators import GENERATORS, generate
+
+# AOC_PROGRESS values to time each input with, see aoc.progress
+PROGRESS_MODES = {'off': ('0',), 'on': ('1',), 'both': ('0', '1')}
+
+
+def sweep(day, sizes=None, seed=2024, module='main', parts=None, budget=None, workdir=None, progress='off'):
+    results = []
+
+    if len(PROGRESS_MODES[progress]) > 1:
+        # every setting has to parse afresh, or the later ones would time the earlier ones' cached parses
+        runner.bypass_cache()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes or GENERATORS[day].sizes:
+            text, params = generate(day, size, seed)
+            path = Path(workdir or tmp) / f'day{day:02d}_{size}.txt'
+            path.write_text(text)
+
+            size_results = []
+            for setting in PROGRESS_MODES[progress]:
+                # read by the spawned workers, where stdout is never a terminal
+                os.environ['AOC_PROGRESS'] = setting
+                size_results += [
+                    result | {'size': size, 'progress': setting == '1'}
+                    for result in runner.run([day], str(path), module, parts, params)
+                ]
+            results += size_results
+
+            # bigger inputs only get slower, stop once the day has blown its time budget
+            if budget and any(result['error'] or result['wall_time'] > budget for result in size_results):
+                break
+
+    return results
+
+
+def growth_exponents(results):
+    # least-squares slope of log(time) over log(size): ~1 is linear, ~2 quadratic and so on
+    series = defaultdict(list)
+    for result in results:
+        if not result['error'] and result['wall_time'] > 0:
+            point = math.log(result['size']), math.log(result['wall_time'])
+            series[(result['day'], result['part'], result['progress'])].append(point)
+
+    exponents = []
+    for (day, part, progress), points in sorted(series.items()):
+        if len({x for x, _ in points}) < 2:
+            continue
+
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        slope = (
+            sum((x - mean_x) * (y - mean_y) for x, y in points) /
+            sum((x - mean_x) ** 2 for x, _ in points)
+        )
+        exponents.append({'day': day, 'part': part, 'progress': progress, 'exponent': round(slope, 2)})
+
+    return exponents
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sweep synthetic input sizes and record scaling curves.')
+    parser.add_argument('days', nargs='*', type=int, help='days to sweep (default: all with a generator)')
+    parser.add_argument('-n', '--sizes', nargs='+', type=int, help='input sizes (default: per-day sweep)')
+    parser.add_argument('-s', '--seed', type=int, default=2024)
+    parser.add_argument('-p', '--part', type=int, action='append', dest='parts', help='only run these parts')
+    parser.add_argument('-m', '--module', default='main', help='solver module in dayNN/src (default: main)')
+    parser.add_argument('-b', '--budget', type=float, help='stop sweeping a day once a part takes longer (seconds)')
+    parser.add_argument('-k', '--keep', help='keep the generated inputs in this directory')
+    parser.add_argument('--progress', choices=sorted(PROGRESS_MODES), default='off',
+                        help='time the solvers with progress reporting off, on, or both (default: off)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='parse inputs afresh, bypassing the parsed-input cache')
+    parser.add_argument('-f', '--format', choices=('json', 'csv'), default='json')
+    parser.add_argument('-o', '--output', help='write results to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    if args.no_cache:
+        runner.bypass_cache()
+
+    if args.keep:
+        Path(args.keep).mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for day in args.days or sorted(GENERATORS):
+        results += sweep(day, args.sizes, args.seed, args.module, args.parts, args.budget, args.keep, args.progress)
+
+    exponents = growth_exponents(results)
+    for row in exponents:
+        reporting = ' (progress on)' if row['progress'] else ''
+        print(f'day{row["day"]:02d} part{row["part"]}: time ~ n^{row["exponent"]}{reporting}', file=sys.stderr)
+
+    stream = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'json':
+            json.dump({'results': results, 'exponents': exponents}, stream, indent=2, default=str)
+            stream.write('\n')
+        else:
+            writer = csv.DictWriter(stream, fieldnames=('size', 'progress', *runner.FIELDS))
+            writer.writeheader()
+            writer.writerows(results)
+    finally:
+        if args.output:
+            stream.close()
+
+
+if __name__ == '__main__':
+    main()
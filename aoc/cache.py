@@ -0,0 +1,146 @@
+import argparse
+import functools
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+# AOC_NO_CACHE=1 bypasses the cache, AOC_CACHE_DIR moves it, AOC_CACHE_MAX_BYTES bounds its size on disk
+DEFAULT_DIR = Path.home() / '.cache' / 'aoc2024'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def cache_dir():
+    return Path(os.environ.get('AOC_CACHE_DIR', DEFAULT_DIR))
+
+
+def enabled():
+    return os.environ.get('AOC_NO_CACHE', '') in ('', '0')
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path, mtime_ns, size):
+    # keyed on mtime and size too, so one process hashes an unchanged file only once
+    digest = hashlib.sha256()
+    with open(path, 'rb') as stream:
+        while chunk := stream.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_digest(filename):
+    path = Path(filename).resolve()
+    stat = path.stat()
+    return _file_digest(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def entry_key(filename, parser, version, args, kwargs):
+    parser_id = f'{Path(parser.__code__.co_filename).resolve()}:{parser.__qualname__}:{version}'
+    key = f'{file_digest(filename)}|{parser_id}|{args!r}|{sorted(kwargs.items())!r}'
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def load(key):
+    for path in (cache_dir() / f'{key}.npy', cache_dir() / f'{key}.pkl'):
+        if not path.exists():
+            continue
+
+        try:
+            # numpy is only imported when an array entry is actually there
+            if path.suffix == '.npy':
+                import numpy as np
+                value = np.load(path)
+            else:
+                with open(path, 'rb') as stream:
+                    value = pickle.load(stream)
+        except ImportError:
+            continue
+        except Exception:
+            # a truncated or stale entry is just a miss
+            path.unlink(missing_ok=True)
+            continue
+
+        # mtime is the LRU clock
+        os.utime(path)
+        return True, value
+
+    return False, None
+
+
+def store(key, value):
+    directory = cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    is_array = type(value).__module__ == 'numpy' and type(value).__name__ == 'ndarray' and value.dtype != object
+    path = directory / f'{key}.{"npy" if is_array else "pkl"}'
+    temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+
+    try:
+        with open(temp_path, 'wb') as stream:
+            if is_array:
+                import numpy as np
+                np.save(stream, value)
+            else:
+                pickle.dump(value, stream, protocol=5)
+        os.replace(temp_path, path)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        temp_path.unlink(missing_ok=True)
+        return
+
+    evict(int(os.environ.get('AOC_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)))
+
+
+def entries():
+    return [path for path in cache_dir().glob('*') if path.suffix in ('.pkl', '.npy')]
+
+
+def evict(max_bytes):
+    stats = sorted(((path.stat(), path) for path in entries()), key=lambda item: item[0].st_mtime_ns)
+    total = sum(stat.st_size for stat, _ in stats)
+
+    for stat, path in stats:
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= stat.st_size
+
+
+def cached_parser(version=1):
+    """Cache a parse_input(filename, ...) result on disk, keyed by file content and parser version.
+
+    Bump `version` whenever the parser's output changes shape.
+    """
+
+    def decorate(parser):
+        @functools.wraps(parser)
+        def wrapper(filename, *args, **kwargs):
+            if not enabled():
+                return parser(filename, *args, **kwargs)
+
+            key = entry_key(filename, parser, version, args, kwargs)
+            hit, value = load(key)
+            if not hit:
+                value = parser(filename, *args, **kwargs)
+                store(key, value)
+
+            return value
+
+        return wrapper
+
+    return decorate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect or clear the parsed-input cache.')
+    parser.add_argument('--clear', action='store_true', help='remove every cached entry')
+    args = parser.parse_args(argv)
+
+    if args.clear:
+        evict(0)
+
+    paths = entries() if cache_dir().exists() else []
+    print(f'{cache_dir()}: {len(paths)} entries, {sum(path.stat().st_size for path in paths)} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,410 @@
+import argparse
+import itertools
+import random
+import string
+import sys
+from collections import namedtuple
+
+# size: what the `n` argument of the generator scales, sizes: default sweep used by aoc.bench,
+# params: extra keyword arguments the day's parts need for an input of that size
+Generator = namedtuple('Generator', 'make size sizes params', defaults=(None,))
+
+GENERATORS = {}
+
+
+def generator(day, size, sizes, params=None):
+    def register(make):
+        GENERATORS[day] = Generator(make, size, sizes, params)
+        return make
+
+    return register
+
+
+def carve_maze(rng, cells):
+    # randomized depth-first search on a cells x cells lattice, rendered on a (2 * cells + 1) square grid
+    side = 2 * cells + 1
+    grid = [['#'] * side for _ in range(side)]
+    grid[1][1] = '.'
+    stack = [(1, 1)]
+
+    while stack:
+        r, c = stack[-1]
+        neighbors = [
+            (r + dr, c + dc, r + dr // 2, c + dc // 2)
+            for dr, dc in ((0, 2), (2, 0), (0, -2), (-2, 0))
+            if 0 < r + dr < side and 0 < c + dc < side and grid[r + dr][c + dc] == '#'
+        ]
+
+        if not neighbors:
+            stack.pop()
+            continue
+
+        nr, nc, wr, wc = rng.choice(neighbors)
+        grid[wr][wc] = grid[nr][nc] = '.'
+        stack.append((nr, nc))
+
+    return grid
+
+
+@generator(1, 'location pairs', (10_000, 100_000, 1_000_000))
+def day01(rng, n):
+    return ''.join(f'{rng.randint(10_000, 99_999)}   {rng.randint(10_000, 99_999)}\n' for _ in range(n))
+
+
+@generator(2, 'reports', (1_000, 10_000, 100_000))
+def day02(rng, n):
+    lines = []
+
+    for _ in range(n):
+        heading = rng.choice((-1, 1))
+        report = [rng.randint(20, 80)]
+        for _ in range(rng.randint(4, 7)):
+            report.append(report[-1] + heading * rng.randint(1, 3))
+
+        # roughly half the reports get a defect the dampener may or may not fix
+        if rng.random() < 0.5:
+            report[rng.randrange(len(report))] += rng.randint(-4, 4)
+
+        lines.append(' '.join(map(str, report)))
+
+    return '\n'.join(lines) + '\n'
+
+
+@generator(3, 'characters of memory', (100_000, 1_000_000, 10_000_000))
+def day03(rng, n):
+    tokens = ("don't()", 'do()', 'mul(', ')', ',', 'mul[', 'do_not_', 'select()', '%', '$', ' ', '&', '+')
+    chunks, length = [], 0
+
+    while length < n:
+        if rng.random() < 0.3:
+            chunk = f'mul({rng.randint(1, 999)},{rng.randint(1, 999)})'
+        else:
+            chunk = rng.choice(tokens)
+        chunks.append(chunk)
+        length += len(chunk)
+
+    return ''.join(chunks) + '\n'
+
+
+@generator(4, 'grid side', (100, 200, 400))
+def day04(rng, n):
+    return ''.join(''.join(rng.choices('XMAS', k=n)) + '\n' for _ in range(n))
+
+
+@generator(5, 'updates', (1_000, 10_000, 100_000))
+def day05(rng, n):
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f'{x}|{y}' for i, x in enumerate(pages) for y in pages[i + 1:]]
+    rng.shuffle(rules)
+    updates = [','.join(map(str, rng.sample(pages, 2 * rng.randint(2, 11) + 1))) for _ in range(n)]
+
+    return '\n'.join(rules) + '\n\n' + '\n'.join(updates) + '\n'
+
+
+@generator(6, 'grid side', (16, 32, 64, 128))
+def day06(rng, n):
+    grid = [['#' if rng.random() < 0.05 else '.' for _ in range(n)] for _ in range(n)]
+    grid[rng.randrange(n // 2, n)][rng.randrange(n)] = '^'
+
+    return ''.join(''.join(row) + '\n' for row in grid)
+
+
+@generator(7, 'equations', (100, 200, 400, 800))
+def day07(rng, n):
+    lines = []
+
+    for _ in range(n):
+        numbers = [rng.randint(1, 999) for _ in range(rng.randint(3, 8))]
+        result = numbers[0]
+        for number in numbers[1:]:
+            op = rng.choice('+*|')
+            result = result + number if op == '+' else result * number if op == '*' else int(f'{result}{number}')
+
+        if rng.random() < 0.5:
+            result += rng.randint(1, 9)
+
+        lines.append(f'{result}: {" ".join(map(str, numbers))}')
+
+    return '\n'.join(lines) + '\n'
+
+
+@generator(8, 'grid side', (50, 100, 200, 400))
+def day08(rng, n):
+    frequencies = string.digits + string.ascii_letters
+    grid = [['.'] * n for _ in range(n)]
+
+    for _ in range(n * n // 12):
+        grid[rng.randrange(n)][rng.randrange(n)] = rng.choice(frequencies)
+
+    return ''.join(''.join(row) + '\n' for row in grid)
+
+
+@generator(9, 'disk map digits', (1_000, 2_000, 4_000, 8_000))
+def day09(rng, n):
+    digits = [rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9) for i in range(n | 1)]
+
+    return ''.join(map(str, digits)) + '\n'
+
+
+@generator(10, 'grid side', (50, 100, 200, 400))
+def day10(rng, n):
+    grid = [[rng.randint(0, 9) for _ in range(n)] for _ in range(n)]
+
+    # plant climbing walks so the map actually has trails
+    for _ in range(n * n // 20):
+        r, c = rng.randrange(n), rng.randrange(n)
+        for height in range(10):
+            grid[r][c] = height
+            dr, dc = rng.choice(((0, 1), (1, 0), (0, -1), (-1, 0)))
+            r, c = min(max(r + dr, 0), n - 1), min(max(c + dc, 0), n - 1)
+
+    return ''.join(''.join(map(str, row)) + '\n' for row in grid)
+
+
+@generator(11, 'initial stones', (8, 64, 512, 4_096))
+def day11(rng, n):
+    return ' '.join(str(rng.randint(0, 10 ** rng.randint(1, 7))) for _ in range(n)) + '\n'
+
+
+@generator(12, 'grid side', (50, 100, 200, 400))
+def day12(rng, n):
+    block = 5
+    coarse = [[rng.choice(string.ascii_uppercase) for _ in range(n // block + 1)] for _ in range(n // block + 1)]
+
+    return ''.join(
+        ''.join(
+            rng.choice(string.ascii_uppercase) if rng.random() < 0.05 else coarse[r // block][c // block]
+            for c in range(n)
+        ) + '\n'
+        for r in range(n)
+    )
+
+
+@generator(13, 'machines', (1_000, 10_000, 100_000))
+def day13(rng, n):
+    machines = []
+
+    for _ in range(n):
+        ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+        a, b = rng.randint(0, 100), rng.randint(0, 100)
+        px, py = a * ax + b * bx, a * ay + b * by
+
+        if rng.random() < 0.5:
+            px, py = px + rng.randint(1, 50), py + rng.randint(1, 50)
+
+        machines.append(f'Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={px}, Y={py}\n')
+
+    return '\n'.join(machines)
+
+
+@generator(14, 'robots', (50, 100, 200, 400))
+def day14(rng, n):
+    width, height = 101, 103
+
+    return ''.join(
+        f'p={rng.randrange(width)},{rng.randrange(height)} v={rng.randint(-99, 99)},{rng.randint(-99, 99)}\n'
+        for _ in range(n)
+    )
+
+
+@generator(15, 'grid side', (10, 20, 40, 80))
+def day15(rng, n):
+    grid = [
+        ['#' if r in (0, n - 1) or c in (0, n - 1) else rng.choices('.#O', weights=(6, 1, 3))[0] for c in range(n)]
+        for r in range(n)
+    ]
+    grid[n // 2][n // 2] = '@'
+    moves = ''.join(rng.choices('^v<>', k=8 * n * n))
+
+    return (
+        ''.join(''.join(row) + '\n' for row in grid) + '\n' +
+        ''.join(moves[i:i + 1000] + '\n' for i in range(0, len(moves), 1000))
+    )
+
+
+@generator(16, 'maze side', (31, 61, 121, 241))
+def day16(rng, n):
+    grid = carve_maze(rng, n // 2)
+    side = len(grid)
+
+    # knock out a few walls so there are several equally good routes
+    for _ in range(side):
+        r, c = rng.randrange(1, side - 1), rng.randrange(1, side - 1)
+        if (r + c) % 2:
+            grid[r][c] = '.'
+
+    grid[side - 2][1], grid[1][side - 2] = 'S', 'E'
+
+    return ''.join(''.join(row) + '\n' for row in grid)
+
+
+@generator(17, 'register A octal digits', (16, 64, 256, 1_024))
+def day17(rng, n):
+    a = rng.randrange(8 ** (n - 1), 8 ** n)
+
+    return f'Register A: {a}\nRegister B: 0\nRegister C: 0\n\nProgram: 2,4,1,3,7,5,4,7,0,3,1,5,5,5,3,0\n'
+
+
+@generator(18, 'grid side', (71, 141, 281, 561), lambda n: {'grid_size': n, 'byte_limit': n * n // 5})
+def day18(rng, n):
+    cells = [(x, y) for x in range(n) for y in range(n) if (x, y) not in ((0, 0), (n - 1, n - 1))]
+    rng.shuffle(cells)
+
+    return ''.join(f'{x},{y}\n' for x, y in cells[:n * n // 2])
+
+
+@generator(19, 'designs', (100, 400, 1_600, 6_400))
+def day19(rng, n):
+    # with no 'r' towel and no towel containing 'rr', any design containing 'rrr' is impossible
+    patterns = sorted(
+        pattern
+        for pattern in {''.join(rng.choices('wubrg', k=rng.randint(1, 8))) for _ in range(450)}
+        if pattern != 'r' and 'rr' not in pattern
+    )
+    designs = []
+
+    for _ in range(n):
+        design = ''
+        while len(design) < rng.randint(20, 60):
+            design += rng.choice(patterns)
+
+        if rng.random() < 0.3:
+            cut = rng.randrange(len(design))
+            design = design[:cut] + 'rrr' + design[cut:]
+
+        designs.append(design)
+
+    return ', '.join(patterns) + '\n\n' + '\n'.join(designs) + '\n'
+
+
+@generator(20, 'maze side', (21, 41, 81, 161))
+def day20(rng, n):
+    # a perfect maze has exactly one route between any two cells, like the puzzle's single racetrack
+    grid = carve_maze(rng, n // 2)
+    side = len(grid)
+    grid[side - 2][1], grid[1][side - 2] = 'S', 'E'
+
+    return ''.join(''.join(row) + '\n' for row in grid)
+
+
+@generator(21, 'codes', (5, 50, 500, 5_000))
+def day21(rng, n):
+    return ''.join(f'{rng.randint(0, 999):03d}A\n' for _ in range(n))
+
+
+@generator(22, 'buyers', (250, 500, 1_000, 2_000))
+def day22(rng, n):
+    return ''.join(f'{rng.randint(1, 0xFFFFFF)}\n' for _ in range(n))
+
+
+@generator(23, 'computers', (500, 1_000, 2_000, 4_000))
+def day23(rng, n):
+    width = 2 if n <= 26 * 26 else 3
+    names = rng.sample(
+        [''.join(letters) for letters in itertools.product(string.ascii_lowercase, repeat=width)], n
+    )
+    edges = set()
+
+    for name in names:
+        for other in rng.sample(names, 6):
+            if other != name:
+                edges.add(tuple(sorted((name, other))))
+
+    # plant one clique that is clearly the largest
+    party = rng.sample(names, 13)
+    edges.update(tuple(sorted((a, b))) for i, a in enumerate(party) for b in party[i + 1:])
+
+    edges = list(edges)
+    rng.shuffle(edges)
+
+    return ''.join(f'{a}-{b}\n' for a, b in edges)
+
+
+@generator(24, 'adder bits', (12, 24, 48, 96))
+def day24(rng, n):
+    # part 2 looks wires up as two-digit names, so the adder is capped at 99 bits
+    x, y = rng.getrandbits(n), rng.getrandbits(n)
+    # internal wires must not look like x/y/z bits
+    names = iter(rng.sample([
+        ''.join(letters) for letters in itertools.product(string.ascii_lowercase, repeat=3) if letters[0] not in 'xyz'
+    ], 5 * n))
+
+    def wire(prefix, bit):
+        return f'{prefix}{bit:02d}'
+
+    gates = [('XOR', wire('x', 0), wire('y', 0), wire('z', 0))]
+    carry = next(names)
+    gates.append(('AND', wire('x', 0), wire('y', 0), carry))
+
+    for bit in range(1, n):
+        part, full, prop = next(names), next(names), next(names)
+        new_carry = wire('z', n) if bit == n - 1 else next(names)
+        gates += [
+            ('XOR', wire('x', bit), wire('y', bit), part),
+            ('AND', wire('x', bit), wire('y', bit), full),
+            ('XOR', part, carry, wire('z', bit)),
+            ('AND', part, carry, prop),
+            ('OR', full, prop, new_carry),
+        ]
+        carry = new_carry
+
+    # four swapped output pairs, each inside one bit so the circuit stays acyclic, never in neighbouring bits
+    for bit in rng.sample(range(2, n - 1, 2), 4):
+        # gates of a bit are laid out as part, full, sum, prop, carry
+        first, second = rng.choice(((0, 1), (2, 4), (2, 3)))
+        a, b = 2 + 5 * (bit - 1) + first, 2 + 5 * (bit - 1) + second
+        (*gate_a, out_a), (*gate_b, out_b) = gates[a], gates[b]
+        gates[a], gates[b] = (*gate_a, out_b), (*gate_b, out_a)
+
+    inputs = [f'{wire("x", bit)}: {x >> bit & 1}' for bit in range(n)]
+    inputs += [f'{wire("y", bit)}: {y >> bit & 1}' for bit in range(n)]
+    rng.shuffle(gates)
+
+    return '\n'.join(inputs) + '\n\n' + ''.join(f'{a} {op} {b} -> {out}\n' for op, a, b, out in gates)
+
+
+@generator(25, 'schematics', (500, 1_000, 2_000, 4_000))
+def day25(rng, n):
+    schematics = []
+
+    for _ in range(n):
+        heights = [rng.randint(0, 5) for _ in range(5)]
+        rows = [''.join('#' if 5 - r < h else '.' for h in heights) for r in range(5)]
+
+        if rng.random() < 0.5:
+            schematics.append('\n'.join(['#####', *reversed(rows), '.....']))
+        else:
+            schematics.append('\n'.join(['.....', *rows, '#####']))
+
+    return '\n\n'.join(schematics) + '\n'
+
+
+def generate(day, n, seed=2024):
+    # every day draws from its own stream, so one day's generator never shifts another's output
+    gen = GENERATORS[day]
+    text = gen.make(random.Random(seed * 100 + day), n)
+    return text, gen.params(n) if gen.params else {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate synthetic Advent of Code inputs.')
+    parser.add_argument('day', type=int)
+    parser.add_argument('size', type=int)
+    parser.add_argument('-s', '--seed', type=int, default=2024)
+    parser.add_argument('-o', '--output', help='write the input to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    text, params = generate(args.day, args.size, args.seed)
+
+    if args.output:
+        with open(args.output, 'w') as stream:
+            stream.write(text)
+    else:
+        sys.stdout.write(text)
+
+    if params:
+        print(f'parameters: {params}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
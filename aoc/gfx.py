@@ -0,0 +1,307 @@
+from pathlib import Path
+
+from aoc.parallel import ordered_map
+
+# Pillow and numpy are imported where they are used, so importing this module stays cheap for headless runs
+
+
+def palette_array(colors):
+    # colour names or RGB tuples to an (n, 3) uint8 lookup table
+    import numpy as np
+    from PIL import ImageColor
+
+    return np.array([ImageColor.getrgb(color)[:3] if isinstance(color, str) else color for color in colors],
+                    dtype=np.uint8).reshape(-1, 3)
+
+
+def to_image(layer, palette, pixel_size=1):
+    """Turn a 2D array of palette indices into an image, each cell becoming a pixel_size square.
+
+    Up to 256 colours give a palette image, which the GIF writer stores without requantising, more an RGB image.
+    """
+    import numpy as np
+    from PIL import Image
+
+    if pixel_size > 1:
+        layer = np.repeat(np.repeat(layer, pixel_size, axis=0), pixel_size, axis=1)
+
+    if len(palette) > 256:
+        return Image.fromarray(palette[layer], 'RGB')
+
+    image = Image.fromarray(layer.astype(np.uint8, copy=False), 'L').convert('P')
+    image.putpalette(palette.tobytes())
+    return image
+
+
+class Raster:
+    """Draws a grid of cells from a static layer painted once plus per-frame overlays.
+
+    Colours are indices into `palette`, cells are (row, col) pairs, or (x, y) pairs with xy=True.
+    """
+
+    def __init__(self, rows, cols, palette, pixel_size=1, background=0, xy=False):
+        import numpy as np
+
+        self.palette = palette_array(palette)
+        self.pixel_size = pixel_size
+        self.xy = xy
+        dtype = np.uint8 if len(self.palette) <= 256 else np.intp
+        self.base = np.full((rows, cols), background, dtype=dtype)
+
+    def index(self, cells):
+        import numpy as np
+
+        cells = np.asarray(cells if isinstance(cells, np.ndarray) else list(cells), dtype=np.intp).reshape(-1, 2)
+        return (cells[:, 1], cells[:, 0]) if self.xy else (cells[:, 0], cells[:, 1])
+
+    def paint(self, cells, color):
+        self.base[self.index(cells)] = color
+        return self
+
+    def paint_mask(self, mask, color):
+        self.base[mask] = color
+        return self
+
+    def layer(self, *overlays):
+        # overlays are (cells, colour) pairs, later ones drawn over earlier ones
+        layer = self.base.copy()
+        for cells, color in overlays:
+            layer[self.index(cells)] = color
+        return layer
+
+    def render(self, *overlays):
+        return to_image(self.layer(*overlays), self.palette, self.pixel_size)
+
+
+class Patch:
+    """The part of a frame that changed: `image` goes at pixel `offset` over the previous frame, its `transparency`
+    pixels leave the previous frame showing through."""
+
+    def __init__(self, image, offset=(0, 0), transparency=None):
+        self.image = image
+        self.offset = offset
+        self.transparency = transparency
+
+
+class DeltaRaster(Raster):
+    """Raster for animations where a few cells change per frame.
+
+    Cells are moved with `set` and `clear` (back to the static layer) and every cell touched is marked dirty. `patch`
+    compares the dirty cells against the last frame and returns a Patch covering only the ones that changed, so a
+    frame costs as much as the motion in it rather than the size of the map. The first patch is the full frame.
+    """
+
+    def __init__(self, rows, cols, palette, pixel_size=1, background=0, xy=False):
+        # one extra palette entry is reserved as the transparent colour of the patches
+        super().__init__(rows, cols, [*palette, (0, 0, 0)], pixel_size, background, xy)
+        self.transparent = len(self.palette) - 1
+        self.current = None
+        self.shown = None
+        self.dirty = []
+
+    def state(self):
+        # the static layer is copied on first use, so it can be painted until then
+        if self.current is None:
+            self.current = self.base.copy()
+        return self.current
+
+    def set(self, cells, color):
+        rows, cols = self.index(cells)
+        self.state()[rows, cols] = color
+        self.dirty.append((rows, cols))
+
+    def clear(self, cells):
+        rows, cols = self.index(cells)
+        self.state()[rows, cols] = self.base[rows, cols]
+        self.dirty.append((rows, cols))
+
+    def patch(self):
+        import numpy as np
+
+        current = self.state()
+        if self.shown is None:
+            self.shown = current.copy()
+            self.dirty.clear()
+            return Patch(to_image(current, self.palette, self.pixel_size))
+
+        rows = np.concatenate([rows for rows, _ in self.dirty] or [np.zeros(0, dtype=np.intp)])
+        cols = np.concatenate([cols for _, cols in self.dirty] or [np.zeros(0, dtype=np.intp)])
+        self.dirty.clear()
+
+        # cells that were touched but ended up as they were, e.g. a robot walking into a wall, are not drawn
+        changed = current[rows, cols] != self.shown[rows, cols]
+        rows, cols = rows[changed], cols[changed]
+
+        if rows.size == 0:
+            # a GIF frame needs at least one pixel, so an idle frame is a single transparent cell
+            window = np.full((1, 1), self.transparent, dtype=current.dtype)
+            return Patch(to_image(window, self.palette, self.pixel_size), (0, 0), self.transparent)
+
+        top, bottom, left, right = rows.min(), rows.max() + 1, cols.min(), cols.max() + 1
+        window = np.full((bottom - top, right - left), self.transparent, dtype=current.dtype)
+        window[rows - top, cols - left] = current[rows, cols]
+        self.shown[rows, cols] = current[rows, cols]
+
+        offset = (int(left) * self.pixel_size, int(top) * self.pixel_size)
+        return Patch(to_image(window, self.palette, self.pixel_size), offset, self.transparent)
+
+
+class GifWriter:
+    """Appends frames to an animated GIF as they come, nothing but the file handle is kept between frames."""
+
+    def __init__(self, path, duration=100, loop=0):
+        self.path = Path(path)
+        self.duration = duration
+        self.loop = loop
+        self.stream = None
+        self.palette = None
+
+    def write(self, frame):
+        from PIL import GifImagePlugin, Image
+
+        patch = frame if isinstance(frame, Patch) else Patch(frame)
+        image = patch.image
+        if image.mode != 'P':
+            image = image.convert('RGB').convert('P', palette=Image.Palette.ADAPTIVE)
+
+        if self.stream is None:
+            header, _ = GifImagePlugin.getheader(image, info={'loop': self.loop, 'duration': self.duration})
+            self.stream = open(self.path, 'wb')
+            self.stream.write(b''.join(header))
+            self.palette = image.palette.tobytes()
+
+        # frames whose palette differs from the first one's carry their own colour table, and every frame is left in
+        # place (disposal 1) for the next patch to be drawn over
+        local_palette = image.palette.tobytes() != self.palette
+        params = {'duration': self.duration, 'disposal': 1, 'include_color_table': local_palette}
+        if patch.transparency is not None:
+            params['transparency'] = patch.transparency
+
+        for chunk in GifImagePlugin.getdata(image, patch.offset, **params):
+            self.stream.write(chunk)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.write(b';')
+            self.stream.close()
+            self.stream = None
+
+
+class PngSequenceWriter:
+    """Writes frame_000000.png, frame_000001.png, ... into a directory, patches are pasted over the previous frame."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0
+        self.canvas = None
+
+    def write(self, frame):
+        if isinstance(frame, Patch):
+            image = frame.image
+            if self.canvas is not None:
+                mask = None
+                if frame.transparency is not None:
+                    mask = image.point(lambda index: 0 if index == frame.transparency else 255, 'L')
+                image = self.canvas.copy()
+                image.paste(frame.image.convert(image.mode), frame.offset, mask)
+        else:
+            image = frame
+
+        self.canvas = image
+        self.path.mkdir(parents=True, exist_ok=True)
+        image.save(self.path / f'frame_{self.count:06d}.png')
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+class FrameSink:
+    """Streams animation frames to disk, keeping every `every`-th frame and at most `max_frames` of them.
+
+    `add` takes an image, a Patch, or a zero-argument callable returning either, the callable is only invoked for
+    frames that are kept, so skipped frames cost nothing to render. A DeltaRaster's patch method fits here as is, the
+    cells changed during skipped frames stay dirty until the next kept one. Paths ending in .gif become an animated
+    GIF, anything else a directory of PNG frames.
+    """
+
+    def __init__(self, path, duration=100, every=1, max_frames=None, loop=0):
+        self.path = Path(path)
+        self.every = every
+        self.max_frames = max_frames
+        self.writer = GifWriter(path, duration, loop) if self.path.suffix == '.gif' else PngSequenceWriter(path)
+        self.offered = 0
+        self.written = 0
+        self.last = None
+
+    def wants(self):
+        # whether the next frame offered would be kept
+        return self.offered % self.every == 0 and not self.done()
+
+    def done(self):
+        # whether the budget is spent, so no frame but a forced one would be kept from now on
+        return self.max_frames is not None and self.written >= self.max_frames
+
+    def add(self, frame, force=False):
+        # forced frames, e.g. a final result, bypass decimation and the budget
+        keep = force or self.wants()
+        self.offered += 1
+
+        if callable(frame):
+            if not keep:
+                return
+            frame = frame()
+
+        self.last = frame
+
+        if keep:
+            self.writer.write(frame)
+            self.written += 1
+
+    def close(self):
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NullSink:
+    every = 1
+    max_frames = 0
+    offered = written = 0
+    last = None
+
+    def wants(self):
+        return False
+
+    def done(self):
+        return True
+
+    def add(self, frame, force=False):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def frame_sink(path, render=True, **options):
+    # headless runs get a sink that drops everything without ever calling a frame factory
+    return FrameSink(path, **options) if render else NullSink()
+
+
+def render_frames(renderer, descriptions, scene=None, workers=None, ahead=4):
+    """Yield renderer(scene, description) for every description, in order, rendered by a pool of processes.
+
+    `renderer` must be a module-level function. The scene, everything the frames share, is sent to each worker once,
+    the descriptions should be compact, e.g. lists of cells and colours.
+    """
+    return ordered_map(renderer, descriptions, scene, workers, ahead)
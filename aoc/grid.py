@@ -0,0 +1,83 @@
+from pathlib import Path
+
+PAD = 0
+
+
+class Grid:
+    """Character grid stored row-major in one flat bytearray, surrounded by `border` cells of padding.
+
+    Cells are addressed by integer index; stepping up to `border` cells past the edge lands on
+    padding instead of wrapping into a neighbouring row, so solvers need no bounds checks.
+    """
+
+    def __init__(self, rows, cols, fill='.', border=1):
+        self.rows, self.cols, self.border = rows, cols, border
+        self.width = cols + 2 * border
+        self.cells = bytearray(self.width * (rows + 2 * border))
+
+        for r in range(rows):
+            start = self.index(r, 0)
+            self.cells[start:start + cols] = fill.encode() * cols
+
+        # N, E, S, W and then the diagonals NE, SE, SW, NW
+        self.offsets4 = (-self.width, 1, self.width, -1)
+        self.offsets8 = self.offsets4 + (1 - self.width, 1 + self.width, self.width - 1, -self.width - 1)
+
+    @classmethod
+    def from_lines(cls, lines, border=1):
+        grid = cls(len(lines), len(lines[0]), border=border)
+
+        for r, line in enumerate(lines):
+            # a longer or shorter slice assignment would resize the bytearray and shift every row after it
+            row = line.encode()
+            if len(row) != grid.cols:
+                raise ValueError(f'Line {r} is {len(row)} bytes wide, expected {grid.cols} like line 0')
+            start = grid.index(r, 0)
+            grid.cells[start:start + grid.cols] = row
+
+        return grid
+
+    @classmethod
+    def from_file(cls, filename, border=1):
+        return cls.from_lines(Path(filename).read_text().strip().splitlines(), border=border)
+
+    def index(self, r, c):
+        return (r + self.border) * self.width + c + self.border
+
+    def position(self, i):
+        r, c = divmod(i, self.width)
+        return r - self.border, c - self.border
+
+    def offset(self, dr, dc):
+        return dr * self.width + dc
+
+    def indices(self):
+        for r in range(self.rows):
+            start = self.index(r, 0)
+            yield from range(start, start + self.cols)
+
+    def find(self, char):
+        i = self.cells.find(char.encode())
+        return i if i >= 0 else None
+
+    def find_all(self, char):
+        code = ord(char)
+        return [i for i in self.indices() if self.cells[i] == code]
+
+    def copy(self):
+        grid = Grid.__new__(Grid)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = self.cells[:]
+        return grid
+
+    def __getitem__(self, i):
+        return self.cells[i]
+
+    def __setitem__(self, i, value):
+        self.cells[i] = value
+
+    def __str__(self):
+        return '\n'.join(
+            self.cells[self.index(r, 0):self.index(r, 0) + self.cols].decode()
+            for r in range(self.rows)
+        )
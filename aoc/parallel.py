@@ -0,0 +1,60 @@
+import importlib.util
+import os
+from collections import deque
+from pathlib import Path
+
+# function and shared data of an ordered_map worker process, set once by its initializer
+_worker = None
+
+
+def load_module(path):
+    # day scripts are loaded from their file rather than imported, named like the runner names them
+    path = Path(path)
+    spec = importlib.util.spec_from_file_location(f'{path.parent.parent.name}_{path.stem}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_function(path, name):
+    return getattr(load_module(path), name)
+
+
+def _init_worker(path, name, shared):
+    global _worker
+    _worker = load_function(path, name), shared
+
+
+def _call(item):
+    func, shared = _worker
+    return func(shared, item)
+
+
+def ordered_map(func, items, shared=None, workers=None, ahead=4):
+    """Yield func(shared, item) for every item, in order, computed by a pool of processes.
+
+    `func` must be a module-level function, a day script's included. `shared`, whatever every call needs, is sent to
+    each worker once, the items should be small. At most `ahead` items per worker are in flight, so memory stays
+    bounded however many items there are. With one worker everything runs in this process without a pool.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for item in items:
+            yield func(shared, item)
+        return
+
+    # spawn rather than fork, the callers may well have threads running
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+
+    initargs = (func.__code__.co_filename, func.__name__, shared)
+    with ProcessPoolExecutor(workers, get_context('spawn'), initializer=_init_worker, initargs=initargs) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(_call, item))
+            if len(pending) >= workers * ahead:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,116 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import tracemalloc
+from pathlib import Path
+
+TOP = 20
+FRAMES = 1
+SAMPLE_INTERVAL = 0.05
+# the traced heap has to grow this much past the last snapshot before another is taken
+SNAPSHOT_GROWTH = 1.1
+
+# allocations made by the profilers themselves or by importing modules are noise
+IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+class PeakSampler(threading.Thread):
+    """Snapshots the traced heap whenever a sample finds it SNAPSHOT_GROWTH times bigger than at the last snapshot, so
+    a steadily growing heap costs a few snapshots rather than one per sample."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.snapshot = None
+        self.size = -1
+
+    def sample(self):
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.size * SNAPSHOT_GROWTH:
+            self.snapshot, self.size = tracemalloc.take_snapshot(), current
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        # short parts may finish before the first tick
+        self.sample()
+
+
+def profile_call(func, *args, **kwargs):
+    # cProfile alone, tracemalloc's bookkeeping would inflate every timing
+    profiler = cProfile.Profile()
+    answer = profiler.runcall(func, *args, **kwargs)
+    return answer, profiler
+
+
+def trace_memory(func, *args, **kwargs):
+    """Run func again under tracemalloc alone, for its peak and the allocation sites at the sampled high-water mark.
+
+    The parse cache is bypassed, or this second run would load what the first one stored instead of parsing.
+    """
+    no_cache = os.environ.get('AOC_NO_CACHE')
+    os.environ['AOC_NO_CACHE'] = '1'
+    tracemalloc.start(FRAMES)
+    sampler = PeakSampler()
+    sampler.start()
+
+    try:
+        func(*args, **kwargs)
+    finally:
+        sampler.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if no_cache is None:
+            del os.environ['AOC_NO_CACHE']
+        else:
+            os.environ['AOC_NO_CACHE'] = no_cache
+
+    return sampler.snapshot.filter_traces(IGNORED), peak
+
+
+def summary(profiler, snapshot=None, peak=None, top=TOP):
+    lines = []
+
+    for title, key in ('cumulative time', 'cumulative'), ('own time', 'tottime'):
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).strip_dirs().sort_stats(key).print_stats(top)
+        # drop pstats' preamble, the table starts at its header row
+        table = stream.getvalue()
+        lines += [f'## Top {top} functions by {title}', table[table.find('   ncalls'):].rstrip(), '']
+
+    if snapshot is None:
+        lines.append('## Memory: not traced, run with --profile-memory')
+        return '\n'.join(lines) + '\n'
+
+    lines += [f'## Memory: peak {peak / 1024:.1f} KiB, top {top} allocation sites at the sampled high-water mark']
+    for stat in snapshot.statistics('lineno')[:top]:
+        frame = stat.traceback[0]
+        lines.append(f'{stat.size / 1024:10.1f} KiB {stat.count:8} blocks  {frame.filename}:{frame.lineno}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_profile(profiler, stem, snapshot=None, peak=None, top=TOP):
+    # the .prof file is raw pstats data for snakeviz and friends, the .txt a readable digest
+    stem = Path(stem)
+    stem.parent.mkdir(parents=True, exist_ok=True)
+
+    profiler.dump_stats(stem.with_suffix('.prof'))
+    report_path = stem.with_suffix('.txt')
+    report_path.write_text(summary(profiler, snapshot, peak, top))
+
+    return report_path
@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+
+# AOC_PROGRESS=0 silences every reporter, AOC_PROGRESS=1 forces them on even when stdout is not a terminal
+DEFAULT_INTERVAL = 0.1
+
+
+class Progress:
+    """Single-line progress on stdout, redrawn at most once per `interval` seconds."""
+
+    def __init__(self, total=None, label='Progress', interval=DEFAULT_INTERVAL, stream=None):
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.next_time = 0.0
+        self.shown = False
+
+    def update(self, done=None, **fields):
+        # the clock check is the only per-call cost, formatting happens at most once per interval
+        now = time.monotonic()
+        if now < self.next_time:
+            return
+
+        self.next_time = now + self.interval
+
+        parts = [f'{done * 100 // self.total}%' if self.total else str(done)] if done is not None else []
+        parts += [f'{name}={value}' for name, value in fields.items()]
+
+        self.stream.write(f'\r\033[2K{self.label}: {", ".join(parts)}')
+        self.stream.flush()
+        self.shown = True
+
+    def close(self):
+        if self.shown:
+            self.stream.write('\r\033[2K')
+            self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NullProgress:
+    def update(self, done=None, **fields):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def enabled(stream=None):
+    setting = os.environ.get('AOC_PROGRESS', '')
+    if setting:
+        return setting != '0'
+
+    stream = stream or sys.stdout
+    return hasattr(stream, 'isatty') and stream.isatty()
+
+
+def progress(total=None, label='Progress', interval=DEFAULT_INTERVAL):
+    # decided once per loop, so a disabled reporter costs a no-op method call per iteration
+    return Progress(total, label, interval) if enabled() else NullProgress()
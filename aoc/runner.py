@@ -0,0 +1,242 @@
+import argparse
+import ast
+import contextlib
+import csv
+import inspect
+import io
+import json
+import os
+import re
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+
+from aoc import cache, profiling
+from aoc.parallel import load_module
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FIELDS = ('day', 'part', 'input', 'answer', 'import_time', 'wall_time', 'cpu_time', 'peak_rss_kb', 'error', 'profile')
+
+
+def day_dir(day):
+    return ROOT / f'day{day:02d}'
+
+
+def module_path(day, module='main'):
+    return day_dir(day) / 'src' / f'{module}.py'
+
+
+def all_days():
+    days = (int(path.name[3:]) for path in ROOT.glob('day[0-9][0-9]'))
+    return sorted(day for day in days if module_path(day).exists())
+
+
+def find_parts(day, module='main'):
+    # scanned from source so the parent never has to import the (possibly heavy) day module
+    source = module_path(day, module).read_text()
+    return sorted(re.findall(r'^def (part\d+)\(', source, re.MULTILINE), key=lambda name: int(name[4:]))
+
+
+def resolve_input(day, input_name):
+    # bare file names live next to the day's puzzle input, anything with a directory is taken as given
+    path = Path(input_name.format(day=day))
+    return path if path.is_absolute() or len(path.parts) > 1 else day_dir(day) / path
+
+
+def load_day(day, module='main'):
+    return load_module(module_path(day, module))
+
+
+def run_part(day, part, input_path, module='main', params=None, profile_dir=None, profile_memory=False):
+    # import time covers the module and everything it imports at top level, i.e. the startup cost of the day
+    import_start = time.perf_counter()
+    func = getattr(load_day(day, module), part)
+    import_time = time.perf_counter() - import_start
+
+    # parameters are shared by all parts of a day, each part only gets the ones it declares
+    accepted = inspect.signature(func).parameters
+    kwargs = {name: value for name, value in (params or {}).items() if name in accepted}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profile_dir:
+            answer, profiler = profiling.profile_call(func, str(input_path), **kwargs)
+        else:
+            answer = func(str(input_path), **kwargs)
+        wall_time, cpu_time = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # a second run after the measurements, so tracemalloc's overhead shows up in neither them nor cProfile's report
+        memory = profiling.trace_memory(func, str(input_path), **kwargs) if profile_dir and profile_memory else ()
+
+    report_path = None
+    if profile_dir:
+        report_path = profiling.write_profile(profiler, Path(profile_dir) / f'day{day:02d}_{module}_{part}', *memory)
+
+    return {
+        'day': day,
+        'part': int(part[4:]),
+        'input': str(input_path),
+        'answer': answer,
+        'import_time': round(import_time, 6),
+        'wall_time': round(wall_time, 6),
+        'cpu_time': round(cpu_time, 6),
+        'peak_rss_kb': peak_rss,
+        'error': None,
+        'profile': str(report_path) if report_path else None,
+    }
+
+
+def failed_part(day, part, input_path, error):
+    return dict.fromkeys(FIELDS) | {'day': day, 'part': int(part[4:]), 'input': str(input_path), 'error': repr(error)}
+
+
+def iter_jobs(days, input_name='my_input.txt', module='main', parts=None):
+    for day in days:
+        input_path = resolve_input(day, input_name)
+        for part in find_parts(day, module):
+            if parts is None or int(part[4:]) in parts:
+                yield day, part, input_path
+
+
+def timings_path():
+    return cache.cache_dir() / 'timings.json'
+
+
+def timing_key(day, part, input_path, module='main'):
+    return f'day{day:02d}/{module}/{part}/{Path(input_path).name}'
+
+
+def load_timings():
+    try:
+        return json.loads(timings_path().read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_timings(timings, results, module='main'):
+    for result in results:
+        if not result['error']:
+            timings[timing_key(result['day'], f'part{result["part"]}', result['input'], module)] = result['wall_time']
+
+    path = timings_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    temp_path.write_text(json.dumps(timings, indent=2, sort_keys=True))
+    os.replace(temp_path, path)
+
+
+def schedule(jobs, timings, module='main'):
+    # longest processing time first: the pool starts tasks in submission order, so the heavy parts begin
+    # straight away and the short ones fill the gaps, parts never timed before count as the heaviest
+    def expected_time(index):
+        day, part, input_path = jobs[index]
+        return timings.get(timing_key(day, part, input_path, module), float('inf'))
+
+    return sorted(range(len(jobs)), key=expected_time, reverse=True)
+
+
+def run(days, input_name='my_input.txt', module='main', parts=None, params=None, profile_dir=None, workers=1,
+        profile_memory=False):
+    jobs = list(iter_jobs(days, input_name, module, parts))
+    timings = load_timings()
+    order = schedule(jobs, timings, module) if workers > 1 else range(len(jobs))
+    results = [None] * len(jobs)
+
+    # every part gets a fresh interpreter: peak RSS is per part and module-level caches do not leak between runs
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'), max_tasks_per_child=1) as executor:
+        futures = {
+            executor.submit(run_part, *jobs[index], module, params, profile_dir, profile_memory): index
+            for index in order
+        }
+
+        for future in as_completed(futures):
+            index = futures[future]
+            day, part, input_path = jobs[index]
+
+            try:
+                result = future.result()
+            except Exception as error:
+                result = failed_part(day, part, input_path, error)
+
+            status = result['error'] or f'{result["wall_time"]:.3f}s'
+            if result['profile']:
+                status += f', profile in {result["profile"]}'
+            print(f'day{day:02d} {part}: {status}', file=sys.stderr)
+            results[index] = result
+
+    save_timings(timings, results, module)
+
+    # whatever order they finished in, results come back in day and part order
+    return results
+
+
+def write_results(results, stream, fmt='json'):
+    if fmt == 'json':
+        json.dump(results, stream, indent=2, default=str)
+        stream.write('\n')
+    elif fmt == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    else:
+        raise ValueError(f'Unknown format: {fmt}')
+
+
+def parse_param(text):
+    name, _, value = text.partition('=')
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name, value
+
+
+def bypass_cache():
+    # through the environment, so the spawned worker processes inherit it
+    os.environ['AOC_NO_CACHE'] = '1'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run and time Advent of Code solutions.')
+    parser.add_argument('days', nargs='*', type=int, help='days to run (default: all)')
+    parser.add_argument('-i', '--input', default='my_input.txt',
+                        help='input file, bare names are looked up in the day directory, {day} is substituted')
+    parser.add_argument('-p', '--part', type=int, action='append', dest='parts', help='only run these parts')
+    parser.add_argument('-m', '--module', default='main', help='solver module in dayNN/src (default: main)')
+    parser.add_argument('-P', '--param', type=parse_param, action='append', dest='params', default=[],
+                        help='extra keyword argument for the parts, e.g. -P width=11')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='run this many parts at once, longest first by their previous timings (default: 1)')
+    parser.add_argument('--profile', nargs='?', const='profiles', metavar='DIR',
+                        help='profile every part with cProfile, writing reports to DIR (default: profiles)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='with --profile, run every part a second time under tracemalloc for its allocation sites')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='parse inputs afresh, bypassing the parsed-input cache')
+    parser.add_argument('-f', '--format', choices=('json', 'csv'), default='json')
+    parser.add_argument('-o', '--output', help='write results to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    if args.no_cache:
+        bypass_cache()
+
+    if args.profile_memory and not args.profile:
+        parser.error('--profile-memory needs --profile')
+
+    days = args.days or all_days()
+    results = run(days, args.input, args.module, args.parts, dict(args.params), args.profile, args.jobs,
+                  args.profile_memory)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as stream:
+            write_results(results, stream, args.format)
+    else:
+        write_results(results, sys.stdout, args.format)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+
+# States are plain ints in range(size), e.g. grid indices or index * 4 + heading.
+# bfs() takes neighbors(state) -> iterable of states, the weighted searches neighbors(state) -> (state, weight).
+
+INF = (1 << 62) - 1
+
+
+class SearchResult:
+    """Distances and predecessors of a finished search, kept in flat arrays indexed by state."""
+
+    def __init__(self, size):
+        self.dist = array('q', [INF]) * size
+        self.parent = array('q', [-1]) * size
+        # predecessors beyond the first, only recorded for ties when every optimal path is wanted
+        self.extra_parents = {}
+
+    def relax(self, state, new_dist, parent, all_preds):
+        if new_dist < self.dist[state]:
+            self.dist[state], self.parent[state] = new_dist, parent
+            self.extra_parents.pop(state, None)
+            return True
+
+        if all_preds and new_dist == self.dist[state] and parent not in (state, self.parent[state]):
+            self.extra_parents.setdefault(state, []).append(parent)
+
+        return False
+
+    def reached(self, state):
+        return self.dist[state] != INF
+
+    def parents(self, state):
+        if self.parent[state] < 0:
+            return []
+        return [self.parent[state], *self.extra_parents.get(state, ())]
+
+    def path(self, target):
+        if not self.reached(target):
+            return []
+
+        path = [target]
+        while self.parent[path[-1]] >= 0:
+            path.append(self.parent[path[-1]])
+
+        return path[::-1]
+
+    def on_optimal_paths(self, targets):
+        # every state some optimal path to one of the targets runs through
+        seen = set(target for target in targets if self.reached(target))
+        stack = list(seen)
+
+        while stack:
+            for parent in self.parents(stack.pop()):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+
+        return seen
+
+    def paths(self, target):
+        # enumerates all optimal paths, which can be exponentially many
+        if not self.reached(target):
+            return
+
+        stack = [(target, [target])]
+        while stack:
+            state, suffix = stack.pop()
+            parents = self.parents(state)
+
+            if not parents:
+                yield suffix[::-1]
+
+            for parent in parents:
+                stack.append((parent, suffix + [parent]))
+
+
+def bfs(starts, neighbors, size, targets=(), all_preds=False):
+    result = SearchResult(size)
+    targets = set(targets)
+    queue = deque()
+
+    for start in starts:
+        result.dist[start] = 0
+        queue.append(start)
+
+    while queue:
+        state = queue.popleft()
+
+        # the layer before the first target is fully expanded by now, so every shortest path into it is known
+        if state in targets:
+            break
+
+        for next_state in neighbors(state):
+            if result.relax(next_state, result.dist[state] + 1, state, all_preds):
+                queue.append(next_state)
+
+    return result
+
+
+def bucket_search(starts, neighbors, size, max_weight, targets=(), all_preds=False):
+    # Dial's algorithm: for small integer weights a ring of max_weight + 1 buckets replaces the heap,
+    # with max_weight == 1 this is 0-1 BFS
+    result = SearchResult(size)
+    targets = set(targets)
+    buckets = [[] for _ in range(max_weight + 1)]
+    pending = 0
+
+    for start in starts:
+        result.dist[start] = 0
+        buckets[0].append(start)
+        pending += 1
+
+    dist = 0
+    goal_dist = INF
+
+    while pending and dist <= goal_dist:
+        bucket = buckets[dist % len(buckets)]
+
+        while bucket:
+            state = bucket.pop()
+            pending -= 1
+
+            if result.dist[state] != dist:
+                continue
+
+            if state in targets:
+                goal_dist = min(goal_dist, dist)
+                if not all_preds:
+                    return result
+                continue
+
+            for next_state, weight in neighbors(state):
+                if result.relax(next_state, dist + weight, state, all_preds):
+                    buckets[(dist + weight) % len(buckets)].append(next_state)
+                    pending += 1
+
+        dist += 1
+
+    return result
+
+
+def dijkstra(starts, neighbors, size, targets=(), all_preds=False, heuristic=None):
+    # with a consistent heuristic this is A*, without one plain Dijkstra
+    result = SearchResult(size)
+    targets = set(targets)
+    heap = []
+
+    for start in starts:
+        result.dist[start] = 0
+        heappush(heap, (heuristic(start) if heuristic else 0, 0, start))
+
+    goal_dist = INF
+
+    while heap:
+        priority, dist, state = heappop(heap)
+
+        # with all_preds, keep settling states that still fit under the best target distance
+        if priority > goal_dist:
+            break
+
+        if dist != result.dist[state]:
+            continue
+
+        if state in targets:
+            goal_dist = min(goal_dist, dist)
+            if not all_preds:
+                break
+            continue
+
+        for next_state, weight in neighbors(state):
+            new_dist = dist + weight
+            if result.relax(next_state, new_dist, state, all_preds):
+                heappush(heap, (new_dist + (heuristic(next_state) if heuristic else 0), new_dist, next_state))
+
+    return result
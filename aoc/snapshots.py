@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from aoc import cache, runner
+
+# answers are stored as strings, so int and str results compare the same way after a JSON round trip, and are shared
+# by every module of a day, while each module keeps its own wall time
+SNAPSHOTS = runner.ROOT / 'snapshots.json'
+
+# parts faster than this are too noisy to flag as slower
+MIN_TIME = 0.05
+
+
+def snapshot_key(day, part, input_path, params=None):
+    key = f'day{day:02d}/part{part}/{cache.file_digest(input_path)[:16]}'
+    if params:
+        key += '/' + ','.join(f'{name}={value!r}' for name, value in sorted(params.items()))
+    return key
+
+
+def display_path(path):
+    path = Path(path).resolve()
+    return str(path.relative_to(runner.ROOT)) if path.is_relative_to(runner.ROOT) else str(path)
+
+
+def load(path=SNAPSHOTS):
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def save(snapshots, path=SNAPSHOTS):
+    path = Path(path)
+    temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    temp_path.write_text(json.dumps(snapshots, indent=2, sort_keys=True) + '\n')
+    os.replace(temp_path, path)
+
+
+def record(snapshots, results, module='main', params=None, force=False):
+    # an existing answer is only replaced with force, a changed answer is far more often a bug than a fix
+    conflicts = []
+
+    for result in results:
+        if result['error']:
+            print(f'day{result["day"]:02d} part{result["part"]}: not recorded, {result["error"]}', file=sys.stderr)
+            continue
+
+        key = snapshot_key(result['day'], result['part'], result['input'], params)
+        answer = str(result['answer'])
+
+        if key in snapshots and snapshots[key]['answer'] != answer and not force:
+            conflicts.append(result)
+            print(f'day{result["day"]:02d} part{result["part"]}: answer {answer} differs from recorded '
+                  f'{snapshots[key]["answer"]}, not recorded (use --force)', file=sys.stderr)
+            continue
+
+        wall_times = snapshots[key]['wall_time'] if key in snapshots else {}
+        snapshots[key] = {
+            'day': result['day'],
+            'part': result['part'],
+            'input': display_path(result['input']),
+            'answer': answer,
+            'wall_time': {**wall_times, module: result['wall_time']},
+        }
+
+    return conflicts
+
+
+def verify(snapshots, results, module='main', params=None, slowdown=2.0, min_time=MIN_TIME):
+    failures = []
+
+    for result in results:
+        name = f'day{result["day"]:02d} part{result["part"]}'
+        snapshot = snapshots.get(snapshot_key(result['day'], result['part'], result['input'], params))
+        # a module checked against another one's answers has no time of its own to be slower than
+        recorded = snapshot['wall_time'].get(module) if snapshot is not None else None
+
+        if result['error']:
+            status = f'FAILED {result["error"]}'
+        elif snapshot is None:
+            status = f'no snapshot, answer {result["answer"]}'
+        elif str(result['answer']) != snapshot['answer']:
+            status = f'MISMATCH {result["answer"]}, expected {snapshot["answer"]}'
+        elif recorded is None:
+            print(f'{name}: ok {result["wall_time"]:.3f}s, no time recorded for {module}', file=sys.stderr)
+            continue
+        elif result['wall_time'] > max(recorded * slowdown, min_time):
+            status = f'SLOWER {result["wall_time"]:.3f}s, recorded {recorded:.3f}s'
+        else:
+            print(f'{name}: ok {result["wall_time"]:.3f}s, recorded {recorded:.3f}s', file=sys.stderr)
+            continue
+
+        print(f'{name}: {status}', file=sys.stderr)
+        if snapshot is not None or result['error']:
+            failures.append(result)
+
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Record answers and timings, or check solutions against them.')
+    parser.add_argument('command', choices=('record', 'verify'))
+    parser.add_argument('days', nargs='*', type=int, help='days to run (default: all)')
+    parser.add_argument('-i', '--input', default='my_input.txt',
+                        help='input file, bare names are looked up in the day directory, {day} is substituted')
+    parser.add_argument('-p', '--part', type=int, action='append', dest='parts', help='only run these parts')
+    parser.add_argument('-m', '--module', default='main', help='solver module in dayNN/src (default: main)')
+    parser.add_argument('-P', '--param', type=runner.parse_param, action='append', dest='params', default=[],
+                        help='extra keyword argument for the parts, e.g. -P width=11')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='run this many parts at once (default: 1)')
+    parser.add_argument('-s', '--slowdown', type=float, default=2.0,
+                        help='verify fails when a part takes longer than this many times its recorded time '
+                             '(default: 2)')
+    parser.add_argument('--min-time', type=float, default=MIN_TIME,
+                        help=f'never flag parts faster than this many seconds as slower (default: {MIN_TIME})')
+    parser.add_argument('--force', action='store_true', help='record answers even when they differ from the snapshot')
+    parser.add_argument('--snapshots', default=SNAPSHOTS, help='snapshot file (default: snapshots.json in the repo)')
+    args = parser.parse_args(argv)
+
+    params = dict(args.params)
+    snapshots = load(args.snapshots)
+    results = runner.run(args.days or runner.all_days(), args.input, args.module, args.parts, params,
+                         workers=args.jobs)
+
+    if args.command == 'record':
+        failures = record(snapshots, results, args.module, params, args.force)
+        save(snapshots, args.snapshots)
+    else:
+        failures = verify(snapshots, results, args.module, params, args.slowdown, args.min_time)
+        print(f'{len(results) - len(failures)}/{len(results)} parts passed', file=sys.stderr)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
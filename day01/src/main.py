@@ -1,25 +1,33 @@
+import sys
 from collections import Counter
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from aoc.cache import cached_parser
+
+
+@cached_parser()
 def parse_input(filename):
     data = Path(filename).read_text().splitlines()
-    return zip(*[map(int, line.split()) for line in data])
+    return [list(column) for column in zip(*[map(int, line.split()) for line in data])]
 
 
-def part1():
-    left_list, right_list = map(sorted, parse_input('my_input.txt'))
+def part1(filename='my_input.txt'):
+    left_list, right_list = map(sorted, parse_input(filename))
     total_distance = sum(abs(l - r) for l, r in zip(left_list, right_list))
 
     print(f'Answer: {total_distance}')
+    return total_distance
 
 
-def part2():
-    left_list, right_list = parse_input('my_input.txt')
+def part2(filename='my_input.txt'):
+    left_list, right_list = parse_input(filename)
     right_count = Counter(right_list)
     similarity_score = sum(l * right_count[l] for l in left_list)
 
     print(f'Answer: {similarity_score}')
+    return similarity_score
 
 
 if __name__ == '__main__':
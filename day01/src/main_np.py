@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.cache import cached_parser
+
+
+@cached_parser()
+def parse_input(filename):
+    # one bulk parse of every whitespace separated number, the pairs are the rows
+    return np.fromfile(filename, dtype=np.int64, sep=' ').reshape(-1, 2)
+
+
+def part1(filename='my_input.txt'):
+    # the transposed copy makes both columns contiguous, so they sort in place
+    left_list, right_list = parse_input(filename).T.copy()
+    left_list.sort()
+    right_list.sort()
+    total_distance = int(np.abs(left_list - right_list).sum())
+
+    print(f'Answer: {total_distance}')
+    return total_distance
+
+
+def part2(filename='my_input.txt'):
+    left_list, right_list = parse_input(filename).T
+    values, counts = np.unique(right_list, return_counts=True)
+
+    # position of each left number among the distinct right numbers, and whether it is actually there
+    index = np.searchsorted(values, left_list).clip(max=len(values) - 1)
+    found = values[index] == left_list
+    similarity_score = int((left_list * counts[index] * found).sum())
+
+    print(f'Answer: {similarity_score}')
+    return similarity_score
+
+
+if __name__ == '__main__':
+    part1()
+    part2()
@@ -0,0 +1,199 @@
+import sys
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.cache import cached_parser
+
+# segments per block of the distance profile, blocks are split in two once they hold twice as many. An update costs
+# O(1) for each block it covers whole and up to a block's worth of work at either end
+BLOCK_SIZE = 128
+
+
+@cached_parser()
+def parse_input(filename):
+    data = Path(filename).read_text().splitlines()
+    return [tuple(map(int, line.split())) for line in data]
+
+
+class Block:
+    """Consecutive segments of the profile, runs of positions sharing one value. Values are stored without the block's
+    pending `shift`, the histogram and the counts at or above and at or below zero are weighted by segment length."""
+
+    __slots__ = ('starts', 'lengths', 'values', 'histogram', 'shift', 'total', 'non_negative', 'non_positive')
+
+    def __init__(self, starts, lengths, values):
+        self.starts, self.lengths, self.values = starts, lengths, values
+        self.histogram = Counter()
+        for length, value in zip(lengths, values):
+            self.histogram[value] += length
+        self.shift = 0
+        self.total = sum(lengths)
+        self.non_negative = sum(weight for value, weight in self.histogram.items() if value >= 0)
+        self.non_positive = sum(weight for value, weight in self.histogram.items() if value <= 0)
+
+    def insert(self, k, start, length, value):
+        stored = value - self.shift
+        self.starts.insert(k, start)
+        self.lengths.insert(k, length)
+        self.values.insert(k, stored)
+
+        self.histogram[stored] += length
+        self.total += length
+        self.non_negative += length * (value >= 0)
+        self.non_positive += length * (value <= 0)
+
+    def split(self, k, position):
+        # both halves keep the segment's value, so none of the weights change
+        length = self.starts[k] + self.lengths[k] - position
+        self.lengths[k] -= length
+        self.starts.insert(k + 1, position)
+        self.lengths.insert(k + 1, length)
+        self.values.insert(k + 1, self.values[k])
+
+    def halves(self):
+        middle = len(self.starts) // 2
+        values = [stored + self.shift for stored in self.values]
+        return (
+            Block(self.starts[:middle], self.lengths[:middle], values[:middle]),
+            Block(self.starts[middle:], self.lengths[middle:], values[middle:]),
+        )
+
+    def add_all(self, step):
+        # the change in sum(length * |value|), only the segments at -1, 0 or 1 move between the counts
+        if step > 0:
+            change = 2 * self.non_negative - self.total
+            self.non_negative += self.histogram[-1 - self.shift]
+            self.non_positive -= self.histogram[-self.shift]
+        else:
+            change = 2 * self.non_positive - self.total
+            self.non_negative -= self.histogram[-self.shift]
+            self.non_positive += self.histogram[1 - self.shift]
+
+        self.shift += step
+        return change
+
+    def add_range(self, lo, hi, step):
+        change = 0
+
+        for k in range(lo, hi):
+            stored, length = self.values[k], self.lengths[k]
+            value = stored + self.shift
+            change += length * (abs(value + step) - abs(value))
+            self.values[k] = stored + step
+
+            self.histogram[stored] -= length
+            self.histogram[stored + step] += length
+            self.non_negative += length * ((value + step >= 0) - (value >= 0))
+            self.non_positive += length * ((value + step <= 0) - (value <= 0))
+
+        return change
+
+
+class LocationLists:
+    """Both location lists, with their total distance and similarity score kept up to date as pairs are added.
+
+    The distance between the sorted lists equals the sum over every integer x of |left(x) - right(x)|, where left(x)
+    and right(x) count the numbers up to x in each list. A pair (l, r) with l < r adds one to that profile on [l, r)
+    and r < l takes one off on [r, l), so an update touches one range of the profile instead of re-sorting. The profile
+    only changes value at numbers seen so far, so it is kept as segments between consecutive distinct numbers, each
+    weighted by its length, in blocks that are shifted whole in O(1). An update costs O(sqrt(distinct numbers)) or
+    so, however far apart its numbers are. The similarity score only needs a count of each list.
+    """
+
+    def __init__(self, pairs=()):
+        self.blocks = []
+        # the first segment start of every block, and where the last segment ends
+        self.firsts = []
+        self.end = None
+        self.left_count = Counter()
+        self.right_count = Counter()
+        self.total_distance = 0
+        self.similarity_score = 0
+
+        for left, right in pairs:
+            self.add(left, right)
+
+    def __len__(self):
+        return self.left_count.total()
+
+    def add(self, left, right):
+        # the new right number matches every left number equal to it, then the new left number every right one
+        self.right_count[right] += 1
+        self.similarity_score += right * self.left_count[right]
+        self.left_count[left] += 1
+        self.similarity_score += left * self.right_count[left]
+
+        if left != right:
+            self.total_distance += self.shift_profile(min(left, right), max(left, right), 1 if left < right else -1)
+
+    def cut(self, position):
+        # make the position a segment boundary, segments of zeros extend the profile to positions outside it
+        if not self.blocks:
+            if self.end is None:
+                self.end = position
+            elif position != self.end:
+                start, self.end = min(position, self.end), max(position, self.end)
+                self.blocks, self.firsts = [Block([start], [self.end - start], [0])], [start]
+            return
+
+        if position < self.firsts[0]:
+            self.blocks[0].insert(0, position, self.firsts[0] - position, 0)
+            self.firsts[0] = position
+            self.rebalance(0)
+        elif position > self.end:
+            last = self.blocks[-1]
+            last.insert(len(last.starts), self.end, position - self.end, 0)
+            self.end = position
+            self.rebalance(len(self.blocks) - 1)
+        elif position < self.end:
+            b = bisect_right(self.firsts, position) - 1
+            block = self.blocks[b]
+            k = bisect_right(block.starts, position) - 1
+            if block.starts[k] != position:
+                block.split(k, position)
+                self.rebalance(b)
+
+    def rebalance(self, b):
+        if len(self.blocks[b].starts) > 2 * BLOCK_SIZE:
+            self.blocks[b:b + 1] = self.blocks[b].halves()
+            self.firsts[b:b + 1] = [block.starts[0] for block in self.blocks[b:b + 2]]
+
+    def shift_profile(self, start, stop, step):
+        self.cut(start)
+        self.cut(stop)
+        change = 0
+
+        for b in range(bisect_right(self.firsts, start) - 1, len(self.blocks)):
+            block = self.blocks[b]
+            if block.starts[0] >= stop:
+                break
+
+            lo, hi = bisect_left(block.starts, start), bisect_left(block.starts, stop)
+            if lo == 0 and hi == len(block.starts):
+                change += block.add_all(step)
+            else:
+                change += block.add_range(lo, hi, step)
+
+        return change
+
+
+def part1(filename='my_input.txt'):
+    total_distance = LocationLists(parse_input(filename)).total_distance
+
+    print(f'Answer: {total_distance}')
+    return total_distance
+
+
+def part2(filename='my_input.txt'):
+    similarity_score = LocationLists(parse_input(filename)).similarity_score
+
+    print(f'Answer: {similarity_score}')
+    return similarity_score
+
+
+if __name__ == '__main__':
+    part1()
+    part2()
@@ -1,7 +1,13 @@
-from itertools import pairwise
+import sys
+from itertools import chain, islice, pairwise
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from aoc.cache import cached_parser
+
+
+@cached_parser()
 def parse_input(filename):
     return [
         list(map(int, line.split()))
@@ -10,36 +16,48 @@ def parse_input(filename):
     ]
 
 
-def is_report_safe(report):
-    differences = [b - a for a, b in pairwise(report)]
-    increasing = all(1 <= diff <= 3 for diff in differences)
-    decreasing = all(-1 >= diff >= -3 for diff in differences)
+def first_unsafe_step(levels, heading):
+    # index of the first level whose step to the next one is out of range for the heading, None if every step is fine
+    for i, (a, b) in enumerate(pairwise(levels)):
+        if not 1 <= heading * (b - a) <= 3:
+            return i
 
-    return increasing or decreasing
+    return None
 
 
-def is_report_safe_with_dampener(report):
-    if is_report_safe(report):
-        return True
+def is_report_safe(report):
+    return first_unsafe_step(report, 1) is None or first_unsafe_step(report, -1) is None
+
 
-    for i in range(len(report)):
-        modified_report = report[:i] + report[i + 1:]
-        if is_report_safe(modified_report):
+def is_report_safe_with_dampener(report):
+    for heading in 1, -1:
+        i = first_unsafe_step(report, heading)
+        if i is None:
             return True
 
+        # removing any level other than the two around the bad step leaves that step in place, and the levels before
+        # it are fine, so each candidate is checked from the level just before it
+        for removed in i, i + 1:
+            start = max(removed - 1, 0)
+            levels = chain(islice(report, start, removed), islice(report, removed + 1, None))
+            if first_unsafe_step(levels, heading) is None:
+                return True
+
     return False
 
 
-def part1():
-    safe_reports = sum(is_report_safe(report) for report in parse_input('my_input.txt'))
+def part1(filename='my_input.txt'):
+    safe_reports = sum(is_report_safe(report) for report in parse_input(filename))
 
     print(f'Answer: {safe_reports}')
+    return safe_reports
 
 
-def part2():
-    safe_reports_with_dampener = sum(is_report_safe_with_dampener(report) for report in parse_input('my_input.txt'))
+def part2(filename='my_input.txt'):
+    safe_reports_with_dampener = sum(is_report_safe_with_dampener(report) for report in parse_input(filename))
 
     print(f'Answer: {safe_reports_with_dampener}')
+    return safe_reports_with_dampener
 
 
 if __name__ == '__main__':
@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.cache import cached_parser
+
+
+@cached_parser()
+def parse_input(filename):
+    # all levels in one flat array, report i being levels[offsets[i]:offsets[i + 1]]
+    raw = Path(filename).read_bytes()
+    data = np.frombuffer(raw, dtype=np.uint8)
+
+    newline = data == ord('\n')
+    digit = (data >= ord('0')) & (data <= ord('9'))
+    number_start = digit & ~np.concatenate(([False], digit[:-1]))
+
+    # every byte belongs to the line its newline ends, a last line without a newline still counts
+    line = np.cumsum(newline) - newline
+    line_count = int(newline.sum()) + (len(raw) > 0 and raw[-1:] != b'\n')
+    lengths = np.bincount(line[number_start], minlength=line_count)
+
+    levels = np.fromstring(raw, dtype=np.int64, sep=' ')
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+    return levels, offsets
+
+
+def unsafe_steps(levels, offsets, heading):
+    # unsafe[i] is whether the step from level i to level i + 1 is out of range, a report's last level has no step
+    unsafe = np.zeros(len(levels), dtype=bool)
+    differences = heading * np.diff(levels)
+    unsafe[:-1] = (differences < 1) | (differences > 3)
+    unsafe[offsets[1:][offsets[1:] > offsets[:-1]] - 1] = False
+    return unsafe
+
+
+def nonempty_starts(offsets):
+    # reduceat needs segments of at least one element, empty reports are safe and left out
+    nonempty = offsets[1:] > offsets[:-1]
+    return nonempty, offsets[:-1][nonempty]
+
+
+def safe_reports(levels, offsets):
+    nonempty, starts = nonempty_starts(offsets)
+    safe = np.ones(len(offsets) - 1, dtype=bool)
+
+    if len(starts):
+        safe[nonempty] = np.zeros(len(starts), dtype=bool)
+        for heading in 1, -1:
+            safe[nonempty] |= np.logical_and.reduceat(~unsafe_steps(levels, offsets, heading), starts)
+
+    return safe
+
+
+def safe_reports_with_dampener(levels, offsets):
+    """The vectorised form of main.py's dampener: for each heading only the two levels around the first unsafe step
+    are candidates for removal. Removing level j is safe when no step from level j + 1 on is unsafe and, for a level
+    inside the report, the bridging step from level j - 1 to j + 1 is in range."""
+    nonempty, starts = nonempty_starts(offsets)
+    safe = np.ones(len(offsets) - 1, dtype=bool)
+
+    if not len(starts):
+        return safe
+
+    ends = offsets[1:][nonempty] - 1
+    positions = np.arange(len(levels))
+    last_level = len(levels) - 1
+    safe_nonempty = np.zeros(len(starts), dtype=bool)
+
+    for heading in 1, -1:
+        unsafe = unsafe_steps(levels, offsets, heading)
+        first_unsafe = np.minimum.reduceat(np.where(unsafe, positions, len(levels)), starts)
+        last_unsafe = np.maximum.reduceat(np.where(unsafe, positions, -1), starts)
+
+        safe_nonempty |= first_unsafe == len(levels)
+
+        for removed in first_unsafe, first_unsafe + 1:
+            # reports without an unsafe step have the sentinel here, clipped so the gather stays in bounds
+            after, before = np.clip(removed + 1, 0, last_level), np.clip(removed - 1, 0, last_level)
+            bridge = heading * (levels[after] - levels[before])
+            inside = (removed > starts) & (removed < ends)
+            bridge_ok = ~inside | ((bridge >= 1) & (bridge <= 3))
+            safe_nonempty |= (first_unsafe < len(levels)) & bridge_ok & (last_unsafe < removed + 1)
+
+    safe[nonempty] = safe_nonempty
+    return safe
+
+
+def part1(filename='my_input.txt'):
+    safe_count = int(safe_reports(*parse_input(filename)).sum())
+
+    print(f'Answer: {safe_count}')
+    return safe_count
+
+
+def part2(filename='my_input.txt'):
+    safe_count_with_dampener = int(safe_reports_with_dampener(*parse_input(filename)).sum())
+
+    print(f'Answer: {safe_count_with_dampener}')
+    return safe_count_with_dampener
+
+
+if __name__ == '__main__':
+    part1()
+    part2()
@@ -1,33 +1,100 @@
+import os
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def part1():
-    memory = Path('my_input.txt').read_text().strip()
-    pattern = r'mul\((\d{1,3}),(\d{1,3})\)'
+from aoc.parallel import ordered_map
 
-    total_sum = sum(
-        int(match.group(1)) * int(match.group(2))
-        for match
-        in re.finditer(pattern, memory)
-    )
+MUL_PATTERN = re.compile(rb'mul\((\d{1,3}),(\d{1,3})\)')
+PATTERN = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|(do\(\)|don't\(\))")
+
+# the longest instruction, mul(999,999), a shorter tail of a chunk may still be the start of one
+MAX_INSTRUCTION = len('mul(999,999)')
+
+CHUNK_SIZE = 1 << 20
+
+# a dump is only split across processes into spans at least this big, smaller ones are not worth starting a pool for
+MIN_SPAN = 32 << 20
+
+
+def instructions(filename, start=0, stop=None, pattern=PATTERN, chunk_size=CHUNK_SIZE):
+    # every instruction starting in bytes [start, stop), read chunk by chunk with each unfinished tail carried over
+    with open(filename, 'rb') as stream:
+        stream.seek(start)
+        offset, buffer = start, b''
+
+        while True:
+            chunk = stream.read(chunk_size)
+            buffer += chunk
+
+            # instructions starting before the cutoff are complete in the buffer, at the end of the file all are
+            cutoff = len(buffer) - (MAX_INSTRUCTION - 1) if chunk else len(buffer)
+            if stop is not None:
+                cutoff = min(cutoff, stop - offset)
+
+            resume = max(cutoff, 0)
+            for match in pattern.finditer(buffer):
+                if match.start() >= cutoff:
+                    break
+                yield match.groups()
+                resume = max(resume, match.end())
+
+            if not chunk or (stop is not None and offset + resume >= stop):
+                return
+
+            buffer = buffer[resume:]
+            offset += resume
+
+
+def spans(filename, workers=None):
+    size = os.path.getsize(filename)
+    count = max(1, min(workers or os.cpu_count() or 1, size // MIN_SPAN))
+    return [(size * i // count, size * (i + 1) // count) for i in range(count)]
+
+
+def product_sum(filename, span):
+    return sum(int(a) * int(b) for a, b in instructions(filename, *span, pattern=MUL_PATTERN))
+
+
+def summarise(filename, span):
+    # (sum if entered enabled, sum if entered disabled, state on exit or None if the span never toggles)
+    before_toggle = after_toggle = 0
+    exit_state = None
+
+    for a, b, toggle in instructions(filename, *span):
+        if toggle is not None:
+            exit_state = toggle == b'do()'
+        elif exit_state is None:
+            before_toggle += int(a) * int(b)
+        elif exit_state:
+            after_toggle += int(a) * int(b)
+
+    return before_toggle + after_toggle, after_toggle, exit_state
+
+
+def part1(filename='my_input.txt', workers=None):
+    work = spans(filename, workers)
+    total_sum = sum(ordered_map(product_sum, work, filename, len(work)))
 
     print(f'Answer: {total_sum}')
+    return total_sum
 
 
-def part2():
-    memory = Path('my_input.txt').read_text().strip()
-    pattern = r'mul\((\d{1,3}),(\d{1,3})\)|(do\(\)|don\'t\(\))'
+def part2(filename='my_input.txt', workers=None):
+    # the spans are scanned in parallel and their summaries folded left to right, which is exact
     mul_enabled = True
     total_sum = 0
 
-    for match in re.finditer(pattern, memory):
-        if match.group(1) and match.group(2) and mul_enabled:
-            total_sum += int(match.group(1)) * int(match.group(2))
-        elif match.group(3):
-            mul_enabled = match.group(3) == 'do()'
+    work = spans(filename, workers)
+    for enabled_sum, disabled_sum, exit_state in ordered_map(summarise, work, filename, len(work)):
+        total_sum += enabled_sum if mul_enabled else disabled_sum
+        if exit_state is not None:
+            mul_enabled = exit_state
 
     print(f'Answer: {total_sum}')
+    return total_sum
 
 
 if __name__ == '__main__':
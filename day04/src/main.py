@@ -1,71 +1,133 @@
+import sys
+from collections import deque
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def part1():
-    grid = Path('my_input.txt').read_text().strip().splitlines()
-    rows, cols = len(grid), len(grid[0])
-    word = "XMAS"
-    word_length = len(word)
-    directions = [
-        (0, 1),   # Right
-        (1, 0),   # Down
-        (0, -1),  # Left
-        (-1, 0),  # Up
-        (1, 1),   # Diagonal down-right
-        (-1, -1), # Diagonal up-left
-        (1, -1),  # Diagonal down-left
-        (-1, 1)   # Diagonal up-right
-    ]
+from aoc.grid import Grid
+
+
+class WordAutomaton:
+    # Aho-Corasick over the words and their reversals, a state lists words ending there as (length, index, forwards)
+    def __init__(self, words):
+        # an empty word would end at the root and match everywhere, main_np.py skips it too
+        self.words = [word for word in dict.fromkeys(words) if word]
+        self.goto = [{}]
+        self.outputs = [[]]
+
+        for index, word in enumerate(self.words):
+            # a palindrome is entered twice, it is found once per direction like any other word
+            for spelling, forwards in (word, True), (word[::-1], False):
+                state = 0
+                for char in spelling:
+                    if char not in self.goto[state]:
+                        self.goto[state][char] = len(self.goto)
+                        self.goto.append({})
+                        self.outputs.append([])
+                    state = self.goto[state][char]
+                self.outputs[state].append((len(word), index, forwards))
+
+        # failure links breadth first from the root's children, whose own link is the root, each state also reports the
+        # words ending at its longest proper suffix
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+                queue.append(child)
+
+    def scan(self, text):
+        # (end, outputs) for every position of the text where at least one word ends
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                yield end, outputs[state]
+
+
+def grid_lines(lines):
+    """Yield (text, start, step) for every row, column, down-right and down-left diagonal of the grid, text[k] being
+    the cell at start + k * step."""
+    rows, cols = len(lines), len(lines[0])
+
+    for r, line in enumerate(lines):
+        yield line, (r, 0), (0, 1)
+
+    for c, column in enumerate(zip(*lines)):
+        yield ''.join(column), (0, c), (1, 0)
+
+    # down-right diagonals start on the top row or the left column, down-left ones on the top row or the right column
+    for r, c in [(0, c) for c in range(cols)] + [(r, 0) for r in range(1, rows)]:
+        yield ''.join(lines[r + k][c + k] for k in range(min(rows - r, cols - c))), (r, c), (1, 1)
 
-    def matches_word(r, c, dr, dc):
-        return (
-            0 <= r + dr * (word_length - 1) < rows and 0 <= c + dc * (word_length - 1) < cols
-            and
-            all(grid[r + i * dr][c + i * dc] == word[i] for i in range(word_length))
-        )
-
-    count = sum(
-        1
-        for dr, dc in directions
-        for r in range(rows)
-        for c in range(cols)
-        if matches_word(r, c, dr, dc)
-    )
+    for r, c in [(0, c) for c in range(cols)] + [(r, cols - 1) for r in range(1, rows)]:
+        yield ''.join(lines[r + k][c - k] for k in range(min(rows - r, c + 1))), (r, c), (1, -1)
+
+
+def find_words(lines, words):
+    # {word: [((r, c), (dr, dc)), ...]}, the cell of each occurrence's first letter and the direction it reads in
+    automaton = WordAutomaton(words)
+    found = {word: [] for word in automaton.words}
+
+    for text, (r, c), (dr, dc) in grid_lines(lines):
+        for end, outputs in automaton.scan(text):
+            for length, index, forwards in outputs:
+                # a backwards match reads from its last position in the line towards the start
+                k = end - length + 1 if forwards else end
+                sign = 1 if forwards else -1
+                found[automaton.words[index]].append(((r + k * dr, c + k * dc), (sign * dr, sign * dc)))
+
+    return found
+
+
+def part1(filename='my_input.txt', words=('XMAS',)):
+    # several words can be given as a comma separated string, e.g. -P words=XMAS,MAS
+    if isinstance(words, str):
+        words = words.split(',')
+
+    lines = Path(filename).read_text().strip().splitlines()
+    count = sum(len(positions) for positions in find_words(lines, words).values())
 
     print(f"Answer: {count}")
+    return count
 
 
-def part2():
-    grid = Path('my_input.txt').read_text().strip().splitlines()
-    rows, cols = len(grid), len(grid[0])
+def part2(filename='my_input.txt'):
+    grid = Grid.from_file(filename)
+    cells = grid.cells
     patterns = [
         ["M.S", ".A.", "M.S"],
         ["M.M", ".A.", "S.S"],
         ["S.M", ".A.", "S.M"],
         ["S.S", ".A.", "M.M"],
     ]
-    pattern_size = 3
-
-    def matches_pattern(r, c):
-        for pattern in patterns:
-            if all(
-                grid[r + dr][c + dc] == pattern[dr][dc]
-                for dr in range(pattern_size)
-                for dc in range(pattern_size)
-                if pattern[dr][dc] != '.'
-            ):
-                return True
-
-        return False
-
-    count = sum(
-        1
-        for r in range(rows - pattern_size + 1)
-        for c in range(cols - pattern_size + 1)
-        if matches_pattern(r, c)
-    )
+    # offsets relative to the centre of the 3x3 window, wildcards dropped
+    patterns = [
+        [
+            (grid.offset(dr - 1, dc - 1), ord(char))
+            for dr, row in enumerate(pattern)
+            for dc, char in enumerate(row)
+            if char != '.'
+        ]
+        for pattern in patterns
+    ]
+
+    def matches_pattern(i):
+        return any(all(cells[i + offset] == char for offset, char in pattern) for pattern in patterns)
+
+    count = sum(1 for i in grid.indices() if matches_pattern(i))
 
     print(f"Answer: {count}")
+    return count
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import numpy as np
+
+X_MAS = (
+    ('M.S', '.A.', 'M.S'),
+    ('M.M', '.A.', 'S.S'),
+    ('S.M', '.A.', 'S.M'),
+    ('S.S', '.A.', 'M.M'),
+)
+
+# anchor rows are matched in bands of about this many cells, which bounds the equality masks held at once
+BAND_CELLS = 1 << 24
+
+
+def parse_input(filename):
+    # the newlines become a last column that is sliced off, the grid is a view of the file's bytes
+    raw = Path(filename).read_bytes().strip() + b'\n'
+    cols = raw.index(b'\n')
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, cols + 1)[:, :cols]
+
+
+def shifted(cells):
+    # the cells moved so the topmost and leftmost ones are at row and column 0
+    if not cells:
+        return ()
+    top, left = min(dr for dr, _, _ in cells), min(dc for _, dc, _ in cells)
+    return tuple((dr - top, dc - left, code) for dr, dc, code in cells)
+
+
+def template_cells(template):
+    # (dr, dc, letter) of every cell of the template but its '.' wildcards, which say nothing, not even that their
+    # cell is inside the grid
+    return shifted([
+        (dr, dc, ord(char))
+        for dr, row in enumerate(template)
+        for dc, char in enumerate(row)
+        if char != '.'
+    ])
+
+
+def word_templates(word):
+    # the word laid out in each of the eight directions
+    return [
+        shifted([(k * dr, k * dc, ord(char)) for k, char in enumerate(word)])
+        for dr in (-1, 0, 1)
+        for dc in (-1, 0, 1)
+        if dr or dc
+    ]
+
+
+def count_matches(grid, templates):
+    """Count the placements of each template, as returned by template_cells, whose cells all lie inside the grid and
+    agree with it, templates without any letter match nowhere. A placement is the AND of one shifted slice of the
+    letter's equality mask per cell."""
+    rows, cols = grid.shape
+    templates = [cells for cells in templates if cells]
+    if not templates:
+        return 0
+
+    height = max(dr for cells in templates for dr, _, _ in cells) + 1
+    codes = {code for cells in templates for _, _, code in cells}
+    band = max(1, BAND_CELLS // max(cols, 1))
+    count = 0
+
+    for top in range(0, rows, band):
+        # the band's anchors plus the rows below them the tallest template reaches into
+        window = grid[top:top + band + height - 1]
+        equal = {code: window == code for code in codes}
+
+        for cells in templates:
+            anchor_rows = min(band, len(window) - max(dr for dr, _, _ in cells))
+            anchor_cols = cols - max(dc for _, dc, _ in cells)
+            if anchor_rows <= 0 or anchor_cols <= 0:
+                continue
+
+            (dr, dc, code), *rest = cells
+            mask = equal[code][dr:dr + anchor_rows, dc:dc + anchor_cols].copy()
+            for dr, dc, code in rest:
+                mask &= equal[code][dr:dr + anchor_rows, dc:dc + anchor_cols]
+            count += int(np.count_nonzero(mask))
+
+    return count
+
+
+def part1(filename='my_input.txt', words=('XMAS',)):
+    # several words can be given as a comma separated string, e.g. -P words=XMAS,MAS
+    if isinstance(words, str):
+        words = words.split(',')
+
+    templates = [cells for word in dict.fromkeys(words) for cells in word_templates(word)]
+    count = count_matches(parse_input(filename), templates)
+
+    print(f'Answer: {count}')
+    return count
+
+
+def part2(filename='my_input.txt', templates=X_MAS):
+    # every placement of every template counts, the default X-MAS ones never match on the same cell
+    if isinstance(templates, str):
+        # from -P, templates are separated by commas and their rows by slashes, e.g. M.S/.A./M.S,S.S/.A./M.M
+        templates = [template.split('/') for template in templates.split(',')]
+
+    count = count_matches(parse_input(filename), map(template_cells, templates))
+
+    print(f'Answer: {count}')
+    return count
+
+
+if __name__ == '__main__':
+    part1()
+    part2()
@@ -1,6 +1,14 @@
+import sys
+from collections import defaultdict
+from functools import cmp_to_key
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from aoc.cache import cached_parser
+
+
+@cached_parser()
 def parse_input(filename):
     rules_section, updates_section = Path(filename).read_text().strip().split('\n\n')
 
@@ -17,12 +25,21 @@ def parse_input(filename):
     return rules, updates
 
 
-def is_order_correct(update, rules):
-    positions = {page: i for i, page in enumerate(update)}
+def rule_index(rules):
+    # the pages each page has to come before, built once and shared by every update
+    successors = defaultdict(set)
     for x, y in rules:
-        if x in positions and y in positions:
-            if positions[x] > positions[y]:
-                return False
+        successors[x].add(y)
+    return successors
+
+
+def is_order_correct(update, successors):
+    # an update is out of order as soon as a page has to come before one already placed
+    placed = set()
+    for page in update:
+        if not successors[page].isdisjoint(placed):
+            return False
+        placed.add(page)
     return True
 
 
@@ -30,13 +47,27 @@ def get_middle_page(update):
     return update[len(update) // 2]
 
 
-def sort_update(update, rules):
-    graph = {page: set() for page in update}
+def sort_update(update, successors):
+    # comparing two pages looks up the one rule between them, which sorts correctly whenever the rules order the
+    # update's pages totally, as the puzzle's do; anything else is checked and falls back to a topological sort
+    def compare(x, y):
+        return -1 if y in successors[x] else 1 if x in successors[y] else 0
+
+    sorted_update = sorted(update, key=cmp_to_key(compare))
+    if is_order_correct(sorted_update, successors):
+        return sorted_update
+
+    return topological_sort(update, successors)
+
+
+def topological_sort(update, successors):
+    # only the rules between pages of this update, found by intersecting with the index instead of scanning every rule
+    pages = set(update)
+    graph = {page: successors[page] & pages for page in update}
     indegree = {page: 0 for page in update}
 
-    for x, y in rules:
-        if x in graph and y in graph:
-            graph[x].add(y)
+    for targets in graph.values():
+        for y in targets:
             indegree[y] += 1
 
     sorted_update = []
@@ -53,27 +84,31 @@ def sort_update(update, rules):
     return sorted_update
 
 
-def part1():
-    rules, updates = parse_input('my_input.txt')
+def part1(filename='my_input.txt'):
+    rules, updates = parse_input(filename)
+    successors = rule_index(rules)
     correct_middle_sum = 0
 
     for update in updates:
-        if is_order_correct(update, rules):
+        if is_order_correct(update, successors):
             correct_middle_sum += get_middle_page(update)
 
     print(f"Answer: {correct_middle_sum}")
+    return correct_middle_sum
 
 
-def part2():
-    rules, updates = parse_input('my_input.txt')
+def part2(filename='my_input.txt'):
+    rules, updates = parse_input(filename)
+    successors = rule_index(rules)
     incorrect_middle_sum = 0
 
     for update in updates:
-        if not is_order_correct(update, rules):
-            corrected_update = sort_update(update, rules)
+        if not is_order_correct(update, successors):
+            corrected_update = sort_update(update, successors)
             incorrect_middle_sum += get_middle_page(corrected_update)
 
     print(f"Answer: {incorrect_middle_sum}")
+    return incorrect_middle_sum
 
 
 if __name__ == "__main__":
@@ -0,0 +1,242 @@
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.parallel import load_module
+
+main = load_module(Path(__file__).with_name('main.py'))
+parse_input, get_middle_page = main.parse_input, main.get_middle_page
+
+
+def strongly_connected(successors):
+    """Tarjan's algorithm without recursion over the dense ids 0..n-1. Each component comes out after every component
+    it can reach, so the closure can be built in the same order."""
+    count = len(successors)
+    order, low = [None] * count, [0] * count
+    on_stack = [False] * count
+    stack, components = [], []
+    visited = 0
+
+    for root in range(count):
+        if order[root] is not None:
+            continue
+
+        order[root] = low[root] = visited
+        visited += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+
+        while work:
+            v, i = work[-1]
+            if i < len(successors[v]):
+                work[-1] = v, i + 1
+                w = successors[v][i]
+                if order[w] is None:
+                    order[w] = low[w] = visited
+                    visited += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w]:
+                    low[v] = min(low[v], order[w])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+
+            if low[v] == order[v]:
+                component = []
+                while not component or component[-1] != v:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                components.append(component)
+
+    return components
+
+
+class RuleClosure:
+    """The transitive closure of the rules, computed once. Pages get dense ids and each id has a bitset, a Python int,
+    of every page it has to come before. A page on a cycle of rules has to come before itself, updates holding two
+    pages of one cycle are checked and sorted by the direct rules instead, like main.py does."""
+
+    def __init__(self, rules):
+        self.direct = main.rule_index(rules)
+        self.reported = set()
+        self.ids = {}
+        for x, y in rules:
+            self.ids.setdefault(x, len(self.ids))
+            self.ids.setdefault(y, len(self.ids))
+        self.pages = list(self.ids)
+
+        self.successors = [[] for _ in self.pages]
+        for x, y in set(rules):
+            self.successors[self.ids[x]].append(self.ids[y])
+
+        self.reach = [0] * len(self.pages)
+        self.component = [0] * len(self.pages)
+        self.on_cycle = [False] * len(self.pages)
+        # pages of each component of the rule graph that contains a cycle
+        self.cycles = []
+
+        for c, members in enumerate(strongly_connected(self.successors)):
+            reach = 0
+            cyclic = len(members) > 1
+            for v in members:
+                self.component[v] = c
+            for v in members:
+                for w in self.successors[v]:
+                    # components are finished in reverse topological order, w's is either this one or done
+                    if self.component[w] == c:
+                        cyclic = True
+                    else:
+                        reach |= 1 << w | self.reach[w]
+            if cyclic:
+                reach |= sum(1 << v for v in members)
+                self.cycles.append([self.pages[v] for v in members])
+            for v in members:
+                self.reach[v] = reach
+                self.on_cycle[v] = cyclic
+
+    def precedes(self, x, y):
+        # whether the rules, applied transitively, put page x before page y
+        if x not in self.ids or y not in self.ids:
+            return False
+        return self.reach[self.ids[x]] >> self.ids[y] & 1 == 1
+
+    def cyclic_pair(self, update):
+        # two pages on one cycle both have to come before the other under the closure, None if the update has no such
+        cyclic = {}
+        for page in update:
+            i = self.ids.get(page)
+            if i is not None and self.on_cycle[i]:
+                other = cyclic.setdefault(self.component[i], page)
+                if other != page:
+                    return other, page
+        return None
+
+    def report_cycle(self, x, y):
+        # once per cycle, the puzzle's own rules form one through every page
+        component = self.component[self.ids[x]]
+        if component not in self.reported:
+            self.reported.add(component)
+            cycle = ' -> '.join(map(str, self.rule_chain(x, y) + self.rule_chain(y, x)[1:]))
+            print(f'pages {x} and {y} are on the rule cycle {cycle}, ordering by the direct rules', file=sys.stderr)
+
+    def is_order_correct(self, update):
+        # pages the rules never mention can go anywhere
+        if self.cyclic_pair(update):
+            return main.is_order_correct(update, self.direct)
+        placed = 0
+        for page in update:
+            i = self.ids.get(page)
+            if i is not None:
+                if self.reach[i] & placed:
+                    return False
+                placed |= 1 << i
+        return True
+
+    def rule_chain(self, x, y):
+        # the shortest chain of rules from page x to page y, as the pages along it, or None if x does not precede y
+        start, goal = self.ids[x], self.ids[y]
+        parents = {}
+        queue = deque([start])
+
+        while queue:
+            v = queue.popleft()
+            for w in self.successors[v]:
+                if w not in parents:
+                    parents[w] = v
+                    if w == goal:
+                        chain = [w]
+                        while chain[-1] != start or len(chain) == 1:
+                            chain.append(parents[chain[-1]])
+                        return [self.pages[u] for u in reversed(chain)]
+                    queue.append(w)
+
+        return None
+
+    def sort(self, update):
+        """Order the update by how many of its other pages each page has to come before. If x comes before y, x also
+        comes before everything y does, so this order is valid whenever one exists. None does when two of the pages
+        are on one cycle, which falls back to main.py's sort by the direct rules."""
+        pair = self.cyclic_pair(update)
+        if pair:
+            self.report_cycle(*pair)
+            return main.sort_update(update, self.direct)
+
+        ids = [self.ids.get(page) for page in update]
+        mask = 0
+        for i in ids:
+            if i is not None:
+                mask |= 1 << i
+
+        # a page on a cycle reaches itself, which is not one of the pages it has to come before
+        ranks = [0 if i is None else (self.reach[i] & mask).bit_count() - self.on_cycle[i] for i in ids]
+        return [page for _, page in sorted(zip(ranks, update), key=lambda pair: -pair[0])]
+
+
+def part1(filename='my_input.txt'):
+    rules, updates = parse_input(filename)
+    closure = RuleClosure(rules)
+    correct_middle_sum = 0
+
+    for update in updates:
+        if closure.is_order_correct(update):
+            correct_middle_sum += get_middle_page(update)
+
+    print(f"Answer: {correct_middle_sum}")
+    return correct_middle_sum
+
+
+def part2(filename='my_input.txt'):
+    rules, updates = parse_input(filename)
+    closure = RuleClosure(rules)
+    incorrect_middle_sum = 0
+
+    for update in updates:
+        if not closure.is_order_correct(update):
+            incorrect_middle_sum += get_middle_page(closure.sort(update))
+
+    print(f"Answer: {incorrect_middle_sum}")
+    return incorrect_middle_sum
+
+
+def benchmark(filename='my_input.txt'):
+    rules, updates = parse_input(filename)
+
+    start = time.perf_counter()
+    closure = RuleClosure(rules)
+    print(f'closure of {len(rules)} rules over {len(closure.pages)} pages: {time.perf_counter() - start:.3f}s')
+    if closure.cycles:
+        print(f'{len(closure.cycles)} cycles, the first through {len(closure.cycles[0])} pages')
+
+    start = time.perf_counter()
+    successors = main.rule_index(rules)
+    print(f'rule index: {time.perf_counter() - start:.3f}s')
+
+    # the updates main.py sorts, the closure sorts those with two pages on one cycle like main.py does
+    incorrect = [update for update in updates if not main.is_order_correct(update, successors)]
+    cyclic = sum(closure.cyclic_pair(update) is not None for update in incorrect)
+    sorts = ('closure', closure.sort), ('topological', lambda update: main.topological_sort(update, successors))
+    for name, sort in sorts:
+        start = time.perf_counter()
+        for update in incorrect:
+            sort(update)
+        print(f'{name} sort of {len(incorrect)} updates: {time.perf_counter() - start:.3f}s')
+    if cyclic:
+        print(f'{cyclic} of them hold two pages on one cycle and were sorted by the direct rules')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        benchmark(*(arg for arg in sys.argv[1:] if arg != '--bench'))
+    else:
+        part1()
+        part2()
@@ -1,89 +1,169 @@
+import sys
+from bisect import bisect_left, bisect_right, insort
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def parse_input(filename):
-    grid = [list(line) for line in Path(filename).read_text().strip().splitlines()]
+from aoc.cache import cached_parser
+from aoc.grid import PAD, Grid
+from aoc.progress import progress
+
+HEADINGS = '^>v<'
+OBSTACLE = ord('#')
 
-    for x, row in enumerate(grid):
-        for y, cell in enumerate(row):
-            if cell in '^>v<':
-                guard_x, guard_y = (x, y)
-                guard_heading = cell
-                grid[x][y] = '.'
 
-    return grid, guard_x, guard_y, guard_heading
+@cached_parser()
+def parse_input(filename):
+    grid = Grid.from_file(filename)
 
+    for heading in HEADINGS:
+        guard = grid.find(heading)
+        if guard is not None:
+            guard_heading = HEADINGS.index(heading)
+            grid[guard] = ord('.')
+            break
 
-def simulate_patrol(grid, guard_x, guard_y, guard_heading):
-    visited = set()
-    moves = {'^': (-1, 0), '>': (0, 1), 'v': (1, 0), '<': (0, -1)}
-    headings = {'^': '>', '>': 'v', 'v': '<', '<': '^'}
+    return grid, guard, guard_heading
 
-    visited.add((guard_x, guard_y, guard_heading))
+
+def simulate_patrol(grid, guard, guard_heading):
+    # states are packed as position * 4 + heading, headings index clockwise into grid.offsets4
+    cells, moves = grid.cells, grid.offsets4
+    visited = {guard * 4 + guard_heading}
 
     while True:
-        dx, dy = moves[guard_heading]
-        new_x, new_y = guard_x + dx, guard_y + dy
+        new_guard = guard + moves[guard_heading]
 
-        if not (0 <= new_x < len(grid) and 0 <= new_y < len(grid[0])):
+        if cells[new_guard] == PAD:
             break
 
-        if grid[new_x][new_y] == '#':
-            guard_heading = headings[guard_heading]
+        if cells[new_guard] == OBSTACLE:
+            guard_heading = (guard_heading + 1) % 4
         else:
-            guard_x, guard_y = new_x, new_y
+            guard = new_guard
+
+        state = guard * 4 + guard_heading
 
-        if (guard_x, guard_y, guard_heading) in visited:
+        if state in visited:
             return visited, True
 
-        visited.add((guard_x, guard_y, guard_heading))
+        visited.add(state)
 
     return visited, False
 
 
-def find_loop_positions(grid, guard_x, guard_y, guard_heading):
+class ObstacleIndex:
+    # sorted obstacle columns of every row and rows of every column, for jumping straight to the next obstacle
+    def __init__(self, grid):
+        self.row_obstacles = [[] for _ in range(grid.rows)]
+        self.column_obstacles = [[] for _ in range(grid.cols)]
+
+        # found in index order, so every list comes out sorted
+        for i in grid.find_all('#'):
+            r, c = grid.position(i)
+            self.row_obstacles[r].append(c)
+            self.column_obstacles[c].append(r)
+
+    def add(self, r, c):
+        insort(self.row_obstacles[r], c)
+        insort(self.column_obstacles[c], r)
+
+    def remove(self, r, c):
+        del self.row_obstacles[r][bisect_left(self.row_obstacles[r], c)]
+        del self.column_obstacles[c][bisect_left(self.column_obstacles[c], r)]
+
+    def jump(self, r, c, heading):
+        # the last cell before the next obstacle ahead, None if the guard leaves the grid first
+        if heading == 0:
+            above = self.column_obstacles[c]
+            k = bisect_left(above, r)
+            return (above[k - 1] + 1, c) if k else None
+        if heading == 1:
+            right = self.row_obstacles[r]
+            k = bisect_right(right, c)
+            return (r, right[k] - 1) if k < len(right) else None
+        if heading == 2:
+            below = self.column_obstacles[c]
+            k = bisect_right(below, r)
+            return (below[k] - 1, c) if k < len(below) else None
+
+        left = self.row_obstacles[r]
+        k = bisect_left(left, c)
+        return (r, left[k - 1] + 1) if k else None
+
+    def is_loop(self, r, c, heading):
+        # a patrol that turns at the same cell and heading twice goes round forever, so only the turns are kept
+        turns = set()
+
+        while True:
+            stop = self.jump(r, c, heading)
+            if stop is None:
+                return False
+
+            (r, c), heading = stop, (heading + 1) % 4
+            if (r, c, heading) in turns:
+                return True
+
+            turns.add((r, c, heading))
+
+
+def find_loop_positions(grid, guard, guard_heading):
+    # one walk of the patrol, trying an obstruction on each cell the first time the guard is about to enter it
+    cells, moves = grid.cells, grid.offsets4
+    index = ObstacleIndex(grid)
+    visited, is_loop = simulate_patrol(grid, guard, guard_heading)
+    patrolled = {state // 4 for state in visited}
+    tried = {guard}
+    walked = set()
     loop_positions = []
-    total_cells = len(grid) * len(grid[0])
-    processed_cells = 0
-    last_percent = 0
+    report = progress(len(patrolled))
 
-    for x, row in enumerate(grid):
-        for y, cell in enumerate(row):
-            processed_cells += 1
+    # a patrol that loops by itself ends when it repeats a state
+    while guard * 4 + guard_heading not in walked:
+        walked.add(guard * 4 + guard_heading)
+        ahead = guard + moves[guard_heading]
 
-            percent = processed_cells * 100 // total_cells
-            if percent > last_percent:
-                print(f'Progress: {percent}%', end='\r', flush=True)
-                last_percent = percent
+        if cells[ahead] == PAD:
+            break
 
-            if (x, y) == (guard_x, guard_y) or cell == '#':
-                continue
+        if cells[ahead] == OBSTACLE:
+            guard_heading = (guard_heading + 1) % 4
+            continue
 
-            grid[x][y] = '#'
+        if ahead not in tried:
+            tried.add(ahead)
+            report.update(len(tried))
 
-            visited, is_loop = simulate_patrol(grid, guard_x, guard_y, guard_heading)
+            obstruction = grid.position(ahead)
+            index.add(*obstruction)
+            if index.is_loop(*grid.position(guard), guard_heading):
+                loop_positions.append(ahead)
+            index.remove(*obstruction)
 
-            if is_loop:
-                loop_positions.append((x, y, visited))
+        guard = ahead
 
-            grid[x][y] = '.'
+    report.close()
 
-    print('\r\033[2K', end='\r')
+    # and then an obstruction anywhere off it leaves it looping
+    if is_loop:
+        loop_positions += [i for i in grid.indices() if i not in patrolled and cells[i] != OBSTACLE]
 
     return loop_positions
 
 
-def part1():
-    grid, guard_x, guard_y, guard_heading = parse_input('my_input.txt')
-    visited, _ = simulate_patrol(grid, guard_x, guard_y, guard_heading)
-    visited_positions = {(x, y) for x, y, _ in visited}
+def part1(filename='my_input.txt'):
+    grid, guard, guard_heading = parse_input(filename)
+    visited, _ = simulate_patrol(grid, guard, guard_heading)
+    visited_positions = {state // 4 for state in visited}
     print(f'Answer: {len(visited_positions)}')
+    return len(visited_positions)
 
 
-def part2():
-    grid, guard_x, guard_y, guard_heading = parse_input('my_input.txt')
-    loop_positions = find_loop_positions(grid, guard_x, guard_y, guard_heading)
+def part2(filename='my_input.txt'):
+    grid, guard, guard_heading = parse_input(filename)
+    loop_positions = find_loop_positions(grid, guard, guard_heading)
     print(f'Answer: {len(loop_positions)}')
+    return len(loop_positions)
 
 
 if __name__ == '__main__':
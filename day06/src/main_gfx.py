@@ -1,5 +1,10 @@
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.progress import progress
+
 RED = "\033[31m"
 YELLOW = "\033[33m"
 WHITE = "\033[37m"
@@ -69,18 +74,13 @@ def simulate_patrol(grid, guard_x, guard_y, guard_heading):
 
 def find_loop_positions(grid, guard_x, guard_y, guard_heading):
     loop_positions = []
-    total_cells = len(grid) * len(grid[0])
     processed_cells = 0
-    last_percent = 0
+    report = progress(len(grid) * len(grid[0]))
 
     for x, row in enumerate(grid):
         for y, cell in enumerate(row):
             processed_cells += 1
-
-            percent = processed_cells * 100 // total_cells
-            if percent > last_percent:
-                print(f'Progress: {percent}%', end='\r', flush=True)
-                last_percent = percent
+            report.update(processed_cells)
 
             if (x, y) == (guard_x, guard_y) or cell == '#':
                 continue
@@ -94,7 +94,7 @@ def find_loop_positions(grid, guard_x, guard_y, guard_heading):
 
             grid[x][y] = '.'
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     sorted_loops = sorted(loop_positions, key=lambda x: len(x[2]))
 
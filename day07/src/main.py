@@ -1,6 +1,13 @@
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from aoc.cache import cached_parser
+from aoc.progress import progress
+
+
+@cached_parser()
 def parse_input(filename):
     input_data = Path(filename).read_text().strip()
     equations = []
@@ -45,35 +52,31 @@ def is_valid_equation(test_value, numbers, allowed_operators):
 
 def calculate_total_calibration(equations, allowed_operators):
     total_calibration_result = 0
-    total_equations = len(equations)
-    completed = 0
-    last_percent = -1
+    report = progress(len(equations))
 
-    for test_value, numbers in equations:
+    for completed, (test_value, numbers) in enumerate(equations, 1):
         if is_valid_equation(test_value, numbers, allowed_operators):
             total_calibration_result += test_value
 
-        completed += 1
-        percent = completed * 100 // total_equations
-        if percent > last_percent:
-            print(f'Progress: {percent}%', end='\r', flush=True)
-            last_percent = percent
+        report.update(completed)
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     return total_calibration_result
 
 
-def part1():
-    equations = parse_input('my_input.txt')
+def part1(filename='my_input.txt'):
+    equations = parse_input(filename)
     result = calculate_total_calibration(equations, allowed_operators=['+', '*'])
     print(f'Answer: {result}')
+    return result
 
 
-def part2():
-    equations = parse_input('my_input.txt')
+def part2(filename='my_input.txt'):
+    equations = parse_input(filename)
     result = calculate_total_calibration(equations, allowed_operators=['+', '*', '||'])
     print(f'Answer: {result}')
+    return result
 
 
 if __name__ == '__main__':
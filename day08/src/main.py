@@ -1,7 +1,13 @@
+import sys
 from collections import defaultdict
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from aoc.cache import cached_parser
+
+
+@cached_parser()
 def parse_input(filename):
     lines = Path(filename).read_text().strip().splitlines()
     antennas = [(x, y, freq) for y, line in enumerate(lines) for x, freq in enumerate(line) if freq != '.']
@@ -45,16 +51,18 @@ def find_antinodes(antennas, width, height, part_two=False):
     return antinodes
 
 
-def part1():
-    antennas, width, height = parse_input('my_input.txt')
+def part1(filename='my_input.txt'):
+    antennas, width, height = parse_input(filename)
     antinodes = find_antinodes(antennas, width, height, part_two=False)
     print(f'Answer: {len(antinodes)}')
+    return len(antinodes)
 
 
-def part2():
-    antennas, width, height = parse_input('my_input.txt')
+def part2(filename='my_input.txt'):
+    antennas, width, height = parse_input(filename)
     antinodes = find_antinodes(antennas, width, height, part_two=True)
     print(f'Answer: {len(antinodes)}')
+    return len(antinodes)
 
 
 if __name__ == '__main__':
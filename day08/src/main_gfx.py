@@ -1,7 +1,10 @@
+import sys
 from collections import defaultdict
 from pathlib import Path
 
-from PIL import Image, ImageDraw
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.gfx import FrameSink, render_frames
 
 
 def parse_input(filename):
@@ -58,51 +61,58 @@ def blend_colors(colors):
     return (r, g, b)
 
 
-def generate_frame(antennas, antinodes, width, height, displayed_antennas, displayed_antinodes):
-    scale = 5
-    image_width, image_height = width * scale, height * scale
-    img = Image.new('RGB', (image_width, image_height), 'black')
-    draw = ImageDraw.Draw(img)
-
-    antenna_colors = {}
+def antenna_colors(antennas):
+    colors = {}
     base_color = 0
     for x, y, freq in antennas:
-        if freq not in antenna_colors:
-            antenna_colors[freq] = (
-                (base_color * 25 % 256, base_color * 75 % 256, base_color * 125 % 256)
-            )
+        if freq not in colors:
+            colors[freq] = (base_color * 25 % 256, base_color * 75 % 256, base_color * 125 % 256)
             base_color += 1
+    return colors
+
+
+def frame_cells(colors, displayed_antennas, displayed_antinodes):
+    # a frame is described by its lit cells only, antinodes dimmed and drawn under the antennas
+    cells = []
 
     for (x, y), freqs in displayed_antinodes.items():
-        colors = [antenna_colors[freq] for freq in freqs]
-        blended_color = blend_colors(colors)
-        attenuated_color = tuple(int(c * 0.5) for c in blended_color)
-        draw.rectangle(
-            [x * scale, y * scale, (x + 1) * scale - 1, (y + 1) * scale - 1], fill=attenuated_color
-        )
+        blended_color = blend_colors([colors[freq] for freq in freqs])
+        cells.append((x, y, tuple(int(c * 0.5) for c in blended_color)))
+
+    cells += [(x, y, colors[freq]) for x, y, freq in displayed_antennas]
 
-    for x, y, freq in displayed_antennas:
-        color = antenna_colors[freq]
-        draw.rectangle(
-            [x * scale, y * scale, (x + 1) * scale - 1, (y + 1) * scale - 1], fill=color
-        )
+    return cells
 
-    return img
 
+def draw_frame(size, cells):
+    from aoc.gfx import Raster
 
-def generate_gif_clear_transition(antennas, antinodes, width, height, output_file):
-    frames = []
+    width, height = size
+    # later cells cover earlier ones, antennas their antinodes, then each colour is painted in one go
+    lit = defaultdict(list)
+    for (x, y), color in {(x, y): color for x, y, color in cells}.items():
+        lit[color].append((x, y))
+
+    raster = Raster(height, width, [(0, 0, 0), *lit], pixel_size=5, xy=True)
+    for color, positions in enumerate(lit.values(), 1):
+        raster.paint(positions, color)
+
+    return raster.render()
+
+
+def transition_frames(antennas, antinodes):
+    colors = antenna_colors(antennas)
     frequency_map = defaultdict(list)
     for x, y, freq in antennas:
         frequency_map[freq].append((x, y))
 
-    frames.append(generate_frame(antennas, antinodes, width, height, [], defaultdict(list)))
+    yield []
 
     for freq, antenna_positions in sorted(frequency_map.items()):
-        frames.append(generate_frame(antennas, antinodes, width, height, [], defaultdict(list)))
+        yield []
 
         displayed_antennas = [(x, y, freq) for x, y in antenna_positions]
-        frames.append(generate_frame(antennas, antinodes, width, height, displayed_antennas, defaultdict(list)))
+        yield frame_cells(colors, displayed_antennas, {})
 
         displayed_antinodes = defaultdict(list)
 
@@ -110,31 +120,35 @@ def generate_gif_clear_transition(antennas, antinodes, width, height, output_fil
             if freq in freqs:
                 displayed_antinodes[(x, y)].append(freq)
 
-        frames.append(generate_frame(antennas, antinodes, width, height, displayed_antennas, displayed_antinodes))
+        yield frame_cells(colors, displayed_antennas, displayed_antinodes)
+
 
-    frames[0].save(
-        output_file,
-        save_all=True,
-        append_images=frames[1:],
-        duration=500,
-        loop=0,
-    )
+def generate_gif_clear_transition(antennas, antinodes, width, height, output_file, workers=None):
+    # the frames are described here and drawn by a pool of processes, in order
+    with FrameSink(output_file, duration=500) as sink:
+        for image in render_frames(draw_frame, transition_frames(antennas, antinodes), (width, height), workers):
+            sink.add(image)
 
 
-def part1():
-    antennas, width, height = parse_input('my_input.txt')
+def part1(filename='my_input.txt', render=True, workers=None):
+    antennas, width, height = parse_input(filename)
     antinodes = find_antinodes(antennas, width, height, part_two=False)
-    generate_gif_clear_transition(antennas, antinodes, width, height, 'part1_clear_animation.gif')
+    if render:
+        generate_gif_clear_transition(antennas, antinodes, width, height, 'part1_clear_animation.gif', workers)
     print(f'Answer: {len(antinodes)}')
+    return len(antinodes)
 
 
-def part2():
-    antennas, width, height = parse_input('my_input.txt')
+def part2(filename='my_input.txt', render=True, workers=None):
+    antennas, width, height = parse_input(filename)
     antinodes = find_antinodes(antennas, width, height, part_two=True)
-    generate_gif_clear_transition(antennas, antinodes, width, height, 'part2_clear_animation.gif')
+    if render:
+        generate_gif_clear_transition(antennas, antinodes, width, height, 'part2_clear_animation.gif', workers)
     print(f'Answer: {len(antinodes)}')
+    return len(antinodes)
 
 
 if __name__ == '__main__':
-    part1()
-    part2()
+    render = '--headless' not in sys.argv
+    part1(render=render)
+    part2(render=render)
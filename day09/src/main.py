@@ -1,19 +1,20 @@
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.progress import progress
+
 EMPTY_SPACE = float('inf')
 
 
 def defragment(blocks, move_whole_files=False):
     total_blocks = len(blocks)
-    last_progress = 0
     search_span_from = 0
+    report = progress(total_blocks)
 
-    for i in reversed(range(total_blocks)):
-        progress = (total_blocks - i) * 100 // total_blocks
-
-        if progress != last_progress:
-            print(f'Progress: {progress}%', end='\r', flush=True)
-            last_progress = progress
+    for done, i in enumerate(reversed(range(total_blocks)), 1):
+        report.update(done)
 
         file_id, file_length = blocks[i]
         if file_id != EMPTY_SPACE:
@@ -33,7 +34,7 @@ def defragment(blocks, move_whole_files=False):
 
                     break
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
 
 def calculate_checksum(blocks):
@@ -45,8 +46,8 @@ def calculate_checksum(blocks):
     )
 
 
-def part1():
-    disk_map = Path('my_input.txt').read_text().strip()
+def part1(filename='my_input.txt'):
+    disk_map = Path(filename).read_text().strip()
     blocks = [
         (i // 2 if i % 2 == 0 else EMPTY_SPACE, 1)
         for i, char in enumerate(disk_map)
@@ -57,10 +58,11 @@ def part1():
 
     result = calculate_checksum(blocks)
     print(f'Answer: {result}')
+    return result
 
 
-def part2():
-    disk_map = Path('my_input.txt').read_text().strip()
+def part2(filename='my_input.txt'):
+    disk_map = Path(filename).read_text().strip()
     blocks = [
         (i // 2 if i % 2 == 0 else EMPTY_SPACE, int(char))
         for i, char in enumerate(disk_map)
@@ -70,6 +72,7 @@ def part2():
 
     result = calculate_checksum(blocks)
     print(f'Answer: {result}')
+    return result
 
 
 if __name__ == '__main__':
@@ -1,25 +1,32 @@
+import functools
+import math
+import sys
 from pathlib import Path
 
-import math
-from PIL import Image
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.gfx import frame_sink, to_image
+from aoc.progress import progress
 
 EMPTY_SPACE = float('inf')
 
 
-def defragment(blocks, move_whole_files=False, frames=None):
+def defragment(blocks, move_whole_files=False, sink=None):
     total_blocks = len(blocks)
-    last_progress = 0
+    last_percent = 0
     search_span_from = 0
+    report = progress(total_blocks)
 
     for i in reversed(range(total_blocks)):
-        progress = (total_blocks - i) * 100 // total_blocks
+        report.update(total_blocks - i)
 
-        if progress != last_progress:
-            print(f'Progress: {progress}%', end='\r', flush=True)
-            last_progress = progress
+        # one frame per percent of the blocks processed
+        percent = (total_blocks - i) * 100 // total_blocks
+        if percent != last_percent:
+            last_percent = percent
 
-            if frames is not None:
-                frames.append(generate_frame(blocks))
+            if sink is not None:
+                sink.add(lambda: generate_frame(blocks))
 
         file_id, file_length = blocks[i]
         if file_id != EMPTY_SPACE:
@@ -39,47 +46,31 @@ def defragment(blocks, move_whole_files=False, frames=None):
 
                     break
 
-    print('\r\033[2K', end='\r')
+    report.close()
+
+
+@functools.lru_cache(maxsize=None)
+def block_palette(file_count):
+    import numpy as np
+
+    # index 0 is empty space, file n is index n + 1
+    file_ids = np.arange(file_count)
+    colors = np.stack([64 + file_ids * 11 % 192, 64 + file_ids * 37 % 192, 64 + file_ids * 59 % 192], axis=1)
+    return np.vstack([[0, 0, 0], colors]).astype(np.uint8)
 
 
 def generate_frame(blocks, scale_factor=2):
-    total_length = sum(length for _, length in blocks)
-    grid_size = math.ceil(math.sqrt(total_length))
-
-    def block_id_to_color(block_id):
-        if block_id == EMPTY_SPACE:
-            return (0, 0, 0)
-        return (
-            64 + int(block_id) * 11 % 192,
-            64 + int(block_id) * 37 % 192,
-            64 + int(block_id) * 59 % 192
-        )
-
-    flat_blocks = []
-    for block_id, length in blocks:
-        flat_blocks.extend([block_id] * length)
-
-    image = Image.new('RGB', (grid_size, grid_size), 'black')
-    for idx, block_id in enumerate(flat_blocks):
-        x, y = divmod(idx, grid_size)
-        if x < grid_size and y < grid_size:
-            image.putpixel((y, x), block_id_to_color(block_id))
-
-    scaled_size = (grid_size * scale_factor, grid_size * scale_factor)
-    image = image.resize(scaled_size, Image.NEAREST)
-
-    return image
-
-
-def save_gif(frames, filename, duration=100):
-    frames[0].save(
-        filename,
-        save_all=True,
-        append_images=frames[1:],
-        duration=duration,
-        loop=0
-    )
-    print(f'GIF saved as: {filename}')
+    import numpy as np
+
+    spans = np.array(blocks)
+    ids = np.where(spans[:, 0] == EMPTY_SPACE, 0, spans[:, 0] + 1).astype(np.intp)
+    cells = np.repeat(ids, spans[:, 1].astype(np.intp))
+
+    grid_size = math.ceil(math.sqrt(cells.size))
+    layer = np.zeros(grid_size * grid_size, dtype=np.intp)
+    layer[:cells.size] = cells
+
+    return to_image(layer.reshape(grid_size, grid_size), block_palette(int(ids.max())), scale_factor)
 
 
 def calculate_checksum(blocks):
@@ -91,37 +82,40 @@ def calculate_checksum(blocks):
     )
 
 
-def part1():
-    disk_map = Path('my_input.txt').read_text().strip()
+def part1(filename='my_input.txt', render=True):
+    disk_map = Path(filename).read_text().strip()
     blocks = [
         (i // 2 if i % 2 == 0 else EMPTY_SPACE, 1)
         for i, char in enumerate(disk_map)
         for _ in range(int(char))
     ]
 
-    frames = [generate_frame(blocks)]
-    defragment(blocks, move_whole_files=False, frames=frames)
-    save_gif(frames, 'part1_animation.gif')
+    with frame_sink('part1_animation.gif', render) as sink:
+        sink.add(lambda: generate_frame(blocks))
+        defragment(blocks, move_whole_files=False, sink=sink)
 
     result = calculate_checksum(blocks)
     print(f'Answer: {result}')
+    return result
 
 
-def part2():
-    disk_map = Path('my_input.txt').read_text().strip()
+def part2(filename='my_input.txt', render=True):
+    disk_map = Path(filename).read_text().strip()
     blocks = [
         (i // 2 if i % 2 == 0 else EMPTY_SPACE, int(char))
         for i, char in enumerate(disk_map)
     ]
 
-    frames = [generate_frame(blocks)]
-    defragment(blocks, move_whole_files=True, frames=frames)
-    save_gif(frames, 'part2_animation.gif')
+    with frame_sink('part2_animation.gif', render) as sink:
+        sink.add(lambda: generate_frame(blocks))
+        defragment(blocks, move_whole_files=True, sink=sink)
 
     result = calculate_checksum(blocks)
     print(f'Answer: {result}')
+    return result
 
 
 if __name__ == '__main__':
-    part1()
-    part2()
+    render = '--headless' not in sys.argv
+    part1(render=render)
+    part2(render=render)
@@ -1,35 +1,27 @@
+import sys
 from collections import deque
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def parse_input(filename):
-    return [
-        [int(char) if char.isdigit() else None for char in line]
-        for line in Path(filename).read_text().strip().splitlines()
-    ]
+from aoc.cache import cached_parser
+from aoc.grid import Grid
 
+# heights stay ASCII digits: a step up is a +1 on the byte, and neither '.' nor padding is ever one above a digit
+SUMMIT = ord('9')
 
-def find_trailheads(topomap):
-    return [
-        (x, y)
-        for y, row in enumerate(topomap)
-        for x, value in enumerate(row)
-        if value == 0
-    ]
+
+@cached_parser()
+def parse_input(filename):
+    return Grid.from_file(filename)
 
 
-def is_valid_move(topomap, current_height, next_pos):
-    x, y = next_pos
-    return (
-        0 <= x < len(topomap[0]) and
-        0 <= y < len(topomap) and
-        topomap[y][x] is not None and
-        topomap[y][x] == current_height + 1
-    )
+def find_trailheads(topomap):
+    return topomap.find_all('0')
 
 
 def count_reachable_nines(topomap, trailhead):
-    directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+    cells = topomap.cells
     queue = deque([trailhead])
     visited = set()
     reachable_nines = 0
@@ -42,66 +34,58 @@ def count_reachable_nines(topomap, trailhead):
 
         visited.add(current_pos)
 
-        x, y = current_pos
-        current_height = topomap[y][x]
+        current_height = cells[current_pos]
 
-        if current_height == 9:
+        if current_height == SUMMIT:
             reachable_nines += 1
             continue
 
-        for dx, dy in directions:
-            next_pos = (x + dx, y + dy)
-            if is_valid_move(topomap, current_height, next_pos):
-                queue.append(next_pos)
+        for step in topomap.offsets4:
+            if cells[current_pos + step] == current_height + 1:
+                queue.append(current_pos + step)
 
     return reachable_nines
 
 
 def count_unique_trails(topomap, trailhead):
-    directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
-    queue = deque([(trailhead, (trailhead,))])
-    visited = set()
+    # heights strictly increase along a trail, so every walk reaching a nine is a distinct trail
+    cells = topomap.cells
+    queue = deque([trailhead])
     trail_count = 0
 
     while queue:
-        current_pos, path = queue.popleft()
-
-        if path in visited:
-            continue
-
-        visited.add(path)
-
-        x, y = current_pos
-        current_height = topomap[y][x]
+        current_pos = queue.popleft()
+        current_height = cells[current_pos]
 
-        if current_height == 9:
+        if current_height == SUMMIT:
             trail_count += 1
             continue
 
-        for dx, dy in directions:
-            next_pos = (x + dx, y + dy)
-            if is_valid_move(topomap, current_height, next_pos):
-                queue.append((next_pos, path + (next_pos,)))
+        for step in topomap.offsets4:
+            if cells[current_pos + step] == current_height + 1:
+                queue.append(current_pos + step)
 
     return trail_count
 
 
-def part1():
-    topomap = parse_input('my_input.txt')
+def part1(filename='my_input.txt'):
+    topomap = parse_input(filename)
     trailheads = find_trailheads(topomap)
 
     total_score = sum(count_reachable_nines(topomap, trailhead) for trailhead in trailheads)
 
     print(f'Answer: {total_score}')
+    return total_score
 
 
-def part2():
-    topomap = parse_input('my_input.txt')
+def part2(filename='my_input.txt'):
+    topomap = parse_input(filename)
     trailheads = find_trailheads(topomap)
 
     total_rating = sum(count_unique_trails(topomap, trailhead) for trailhead in trailheads)
 
     print(f'Answer: {total_rating}')
+    return total_rating
 
 
 if __name__ == '__main__':
@@ -1,8 +1,12 @@
+import sys
 from collections import deque
 from pathlib import Path
 from random import shuffle
 
-from PIL import Image, ImageDraw
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.gfx import frame_sink
+from aoc.progress import progress
 
 
 def parse_input(filename):
@@ -31,20 +35,56 @@ def is_valid_move(topomap, current_height, next_pos):
     )
 
 
-def count_unique_trails_with_visualization(topomap, trailhead, frames, pixel_size=6):
-    directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
-    queue = deque([(trailhead, (trailhead,))])
-    visited = set()
+def draw_trail(topomap, path, last, fades, pixel_size):
+    import numpy as np
+    from PIL import Image, ImageDraw
 
-    if frames:
-        image = frames[-1]
+    # every trail fades the canvas, so the last kept frame is faded once per trail offered since, skipped ones included
+    if last is None:
+        canvas = np.zeros((len(topomap) * pixel_size, len(topomap[0]) * pixel_size, 3), dtype=np.uint8)
     else:
-        image = Image.new(
-            'RGB',
-            (len(topomap[0]) * pixel_size, len(topomap) * pixel_size),
-            color=(0, 0, 0)
+        canvas = (np.asarray(last) * 0.99 ** fades).astype(np.uint8)
+
+    image = Image.fromarray(canvas, 'RGB')
+    draw = ImageDraw.Draw(image)
+
+    for i in range(len(path) - 1):
+        px, py = path[i]
+        next_px, next_py = path[i + 1]
+        draw.line(
+            [
+                (px * pixel_size + pixel_size // 2, py * pixel_size + pixel_size // 2),
+                (next_px * pixel_size + pixel_size // 2, next_py * pixel_size + pixel_size // 2),
+            ],
+            fill='white',
+            width=pixel_size // 2,
         )
 
+    start_x, start_y = path[0]
+    draw.ellipse(
+        [
+            (start_x * pixel_size, start_y * pixel_size),
+            (start_x * pixel_size + pixel_size, start_y * pixel_size + pixel_size),
+        ],
+        fill='red',
+    )
+
+    end_x, end_y = path[-1]
+    draw.ellipse(
+        [
+            (end_x * pixel_size, end_y * pixel_size),
+            (end_x * pixel_size + pixel_size, end_y * pixel_size + pixel_size),
+        ],
+        fill='blue',
+    )
+
+    return image
+
+
+def count_unique_trails_with_visualization(topomap, trailhead, sink, pixel_size=6):
+    directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+    queue = deque([(trailhead, (trailhead,))])
+    visited = set()
     trail_count = 0
 
     while queue:
@@ -61,46 +101,8 @@ def count_unique_trails_with_visualization(topomap, trailhead, frames, pixel_siz
         if current_height == 9:
             trail_count += 1
 
-            image = image.copy()
-            pixels = image.load()
-            for i in range(image.width):
-                for j in range(image.height):
-                    r, g, b = pixels[i, j]
-                    pixels[i, j] = (r * 99 // 100, g * 99 // 100, b * 99 // 100)
-
-            draw = ImageDraw.Draw(image)
-
-            for i in range(len(path) - 1):
-                px, py = path[i]
-                next_px, next_py = path[i + 1]
-                draw.line(
-                    [
-                        (px * pixel_size + pixel_size // 2, py * pixel_size + pixel_size // 2),
-                        (next_px * pixel_size + pixel_size // 2, next_py * pixel_size + pixel_size // 2),
-                    ],
-                    fill='white',
-                    width=pixel_size // 2,
-                )
-
-            start_x, start_y = path[0]
-            draw.ellipse(
-                [
-                    (start_x * pixel_size, start_y * pixel_size),
-                    (start_x * pixel_size + pixel_size, start_y * pixel_size + pixel_size),
-                ],
-                fill='red',
-            )
-
-            end_x, end_y = path[-1]
-            draw.ellipse(
-                [
-                    (end_x * pixel_size, end_y * pixel_size),
-                    (end_x * pixel_size + pixel_size, end_y * pixel_size + pixel_size),
-                ],
-                fill='blue',
-            )
-
-            frames.append(image)
+            # only drawn if the sink keeps it, on top of the last frame it kept
+            sink.add(lambda: draw_trail(topomap, path, sink.last, sink.every, pixel_size))
 
             continue
 
@@ -112,28 +114,25 @@ def count_unique_trails_with_visualization(topomap, trailhead, frames, pixel_siz
     return trail_count
 
 
-def part2_with_gif():
-    topomap = parse_input('my_input.txt')
+def part2(filename='my_input.txt', render=True):
+    topomap = parse_input(filename)
     trailheads = find_trailheads(topomap)
     shuffle(trailheads)
 
-    frames = []
+    sink = frame_sink('part2_visualization.gif', render, duration=10)
     total_rating = 0
+    report = progress(len(trailheads))
 
     for i, trailhead in enumerate(trailheads):
-        total_rating += count_unique_trails_with_visualization(topomap, trailhead, frames)
-        print(f'Progress: {i * 100 // len(trailheads)}%', end='\r', flush=True)
-
-    frames[0].save(
-        'part2_visualization.gif',
-        save_all=True,
-        append_images=frames[1:],
-        duration=10,
-        loop=0,
-    )
+        total_rating += count_unique_trails_with_visualization(topomap, trailhead, sink)
+        report.update(i)
+
+    report.close()
+    sink.close()
 
     print(f'Answer: {total_rating}')
+    return total_rating
 
 
 if __name__ == '__main__':
-    part2_with_gif()
+    part2(render='--headless' not in sys.argv)
@@ -1,6 +1,11 @@
+import sys
 from collections import Counter
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.progress import progress
+
 
 def blink(stone_counts):
     updated_counts = Counter()
@@ -24,37 +29,42 @@ def blink(stone_counts):
 def count_stones(initial, blinks):
     stone_counts = Counter(initial)
 
+    report = progress(blinks)
+
     for i in range(blinks):
         stone_counts = blink(stone_counts)
-        print(f'Progress: {i * 100 // blinks}%', end='\r', flush=True)
+        report.update(i)
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     return sum(stone_counts.values())
 
 
-def part1():
-    data = Path('my_input.txt').read_text().strip()
+def part1(filename='my_input.txt'):
+    data = Path(filename).read_text().strip()
     initial = list(map(int, data.split()))
     result = count_stones(initial, 25)
 
     print(f'Answer: {result}')
+    return result
 
 
-def part2():
-    data = Path('my_input.txt').read_text().strip()
+def part2(filename='my_input.txt'):
+    data = Path(filename).read_text().strip()
     initial = list(map(int, data.split()))
     result = count_stones(initial, 75)
 
     print(f'Answer: {result}')
+    return result
 
 
-def part3():
-    input_data = Path('my_input.txt').read_text().strip()
+def part3(filename='my_input.txt'):
+    input_data = Path(filename).read_text().strip()
     initial = list(map(int, input_data.split()))
     result = count_stones(initial, 1000)
 
     print(f'Answer: {result}')
+    return result
 
 
 if __name__ == '__main__':
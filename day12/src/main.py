@@ -1,25 +1,29 @@
+import sys
 from pathlib import Path
 
-DIRECTIONS = (('N', (-1, 0)), ('E', (0, 1)), ('S', (1, 0)), ('W', (0, -1)))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from aoc.cache import cached_parser
+from aoc.grid import Grid
 
+DIRECTIONS = ('N', 'E', 'S', 'W')
+
+
+@cached_parser()
 def parse_input(filename):
-    lines = Path(filename).read_text().strip().splitlines()
-    return {
-        (r, c): cell
-        for r, line in enumerate(lines)
-        for c, cell in enumerate(line.strip())
-    }
+    return Grid.from_file(filename)
 
 
 def find_regions(world):
-    visited = set()
+    cells = world.cells
+    visited = bytearray(len(cells))
     regions = []
 
-    for pos, cell in world.items():
-        if pos in visited:
+    for pos in world.indices():
+        if visited[pos]:
             continue
 
+        cell = cells[pos]
         stack = [pos]
         region = set()
         edges = set()
@@ -27,19 +31,18 @@ def find_regions(world):
         while stack:
             pos = stack.pop()
 
-            if pos in visited:
+            if visited[pos]:
                 continue
 
-            visited.add(pos)
+            visited[pos] = 1
 
             region.add(pos)
-            r, c = pos
 
-            for dir_name, (dr, dc), in DIRECTIONS:
-                new_pos = r + dr, c + dc
-                if world.get(new_pos) != cell:
+            for dir_name, step in zip(DIRECTIONS, world.offsets4):
+                new_pos = pos + step
+                if cells[new_pos] != cell:
                     edges.add((dir_name, new_pos))
-                elif new_pos not in visited:
+                elif not visited[new_pos]:
                     stack.append(new_pos)
 
         regions.append((pos, cell, region, edges))
@@ -47,39 +50,34 @@ def find_regions(world):
     return regions
 
 
-def count_sides(edges: set):
-    total_sides = 4
-
-    for dir_name, _ in DIRECTIONS:
-        sorted_edges = sorted((r, c) if dir_name in 'NS' else (c, r) for d, (r, c) in edges if d == dir_name)
-        total_sides += sum(
-            1
-                for (r1, c1), (r2, c2) in zip(sorted_edges, sorted_edges[1:])
-                if r1 != r2 or abs(c1 - c2) != 1
-        )
+def count_sides(world, edges: set):
+    # an edge starts a new side unless the edge before it along the same side exists
+    along = {'N': 1, 'S': 1, 'E': world.width, 'W': world.width}
 
-    return total_sides
+    return sum(1 for dir_name, pos in edges if (dir_name, pos - along[dir_name]) not in edges)
 
 
-def part1():
-    world = parse_input('my_input.txt')
+def part1(filename='my_input.txt'):
+    world = parse_input(filename)
     total_cost = 0
 
     for pos, cell, region, edges in find_regions(world):
         total_cost += len(region) * len(edges)
 
     print(f'Answer: {total_cost}')
+    return total_cost
 
 
-def part2():
-    world = parse_input('my_input.txt')
+def part2(filename='my_input.txt'):
+    world = parse_input(filename)
     total_cost = 0
 
     for pos, cell, region, edges in find_regions(world):
-        sides = count_sides(edges)
+        sides = count_sides(world, edges)
         total_cost += len(region) * sides
 
     print(f'Answer: {total_cost}')
+    return total_cost
 
 
 if __name__ == '__main__':
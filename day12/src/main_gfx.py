@@ -1,9 +1,21 @@
+import os
+import sys
 from pathlib import Path
 
-from PIL import Image, ImageDraw, ImageFont
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.gfx import Raster, render_frames
+from aoc.progress import progress
 
 DIRECTIONS = (('N', (-1, 0)), ('E', (0, 1)), ('S', (1, 0)), ('W', (0, -1)))
 
+# one image per metric: its colour scheme, title and file
+METRICS = (
+    ('area', (2, 2, 0), 'areas of regions', 'day11_area.png'),
+    ('perim', (2, 2, 1), 'perimeters of regions', 'day11_perim.png'),
+    ('sides', (0, 2, 2), 'number of sides in regions', 'day11_sides.png'),
+)
+
 
 def parse_input(filename):
     lines = Path(filename).read_text().strip().splitlines()
@@ -78,6 +90,8 @@ def count_sides(edges: set):
 
 
 def draw_text(draw, region, cell_size, text):
+    from PIL import ImageFont
+
     y = sum(r for r, _ in region) * cell_size // len(region) + cell_size // 2
     x = sum(c for _, c in region) * cell_size // len(region) + cell_size // 2
 
@@ -93,6 +107,8 @@ def draw_text(draw, region, cell_size, text):
 
 
 def draw_text2(draw, x, y, text):
+    from PIL import ImageFont
+
     font = ImageFont.truetype("arialbd.ttf", 50)  # Arial Bold
 
     # Draw shadow as outline
@@ -105,19 +121,6 @@ def draw_text2(draw, x, y, text):
     draw.text((x, y), text, fill="white", font=font, anchor="mm")
 
 
-def setup_images(rows, cols, cell_size):
-    """Initialize images and drawing contexts."""
-    img_area = Image.new('RGB', (cols * cell_size, rows * cell_size), 'black')
-    img_perim = Image.new('RGB', (cols * cell_size, rows * cell_size), 'black')
-    img_sides = Image.new('RGB', (cols * cell_size, rows * cell_size), 'black')
-    return (
-        img_area, img_perim, img_sides,
-        ImageDraw.Draw(img_area),
-        ImageDraw.Draw(img_perim),
-        ImageDraw.Draw(img_sides),
-    )
-
-
 def compute_color(value, max_value, color_scheme):
     """Compute color based on value and color scheme."""
     return (
@@ -127,14 +130,6 @@ def compute_color(value, max_value, color_scheme):
     )
 
 
-def draw_region(draw, region, cell_size, color):
-    """Draw a region on the image."""
-    for r, c in region:
-        x0, y0 = c * cell_size, r * cell_size
-        x1, y1 = x0 + cell_size, y0 + cell_size
-        draw.rectangle([x0, y0, x1, y1], fill=color)
-
-
 def draw_edges(draw, edges, cell_size):
     """Draw edges as lines on the image."""
     for dir_name, (dr, dc) in DIRECTIONS:
@@ -149,67 +144,76 @@ def draw_edges(draw, edges, cell_size):
                 draw.line([x0, y0, x1, y1], fill='black', width=1)
 
 
-def process_region(info, draw_area, draw_perim, draw_sides, cell_size, max_values):
-    """Process and draw a single region."""
-    color_area = compute_color(info['area'], max_values['area'], (2, 2, 0))
-    color_perim = compute_color(info['perim'], max_values['perim'], (2, 2, 1))
-    color_sides = compute_color(info['sides'], max_values['sides'], (0, 2, 2))
+def draw_metric(scene, metric):
+    """Draw every region coloured and labelled by one metric, the images are independent and drawn in parallel."""
+    from PIL import ImageDraw
 
-    draw_region(draw_area, info['region'], cell_size, color_area)
-    draw_region(draw_perim, info['region'], cell_size, color_perim)
-    draw_region(draw_sides, info['region'], cell_size, color_sides)
+    rows, cols, cell_size, regions = scene
+    key, color_scheme, title, _ = metric
+    max_value = max(info[key] for info in regions)
 
-    draw_edges(draw_area, info['edges'], cell_size)
-    draw_edges(draw_perim, info['edges'], cell_size)
-    draw_edges(draw_sides, info['edges'], cell_size)
+    # each region is its own palette entry, painted whole into the raster before the lines and labels go on top
+    colors = [compute_color(info[key], max_value, color_scheme) for info in regions]
+    raster = Raster(rows, cols, [(0, 0, 0), *colors], pixel_size=cell_size)
+    for color, info in enumerate(regions, 1):
+        raster.paint(info['region'], color)
 
-    draw_text(draw_area, info['region'], cell_size, str(info['area']))
-    draw_text(draw_perim, info['region'], cell_size, str(info['perim']))
-    draw_text(draw_sides, info['region'], cell_size, str(info['sides']))
+    img = raster.render().convert('RGB')
+    draw = ImageDraw.Draw(img)
 
+    for info in regions:
+        draw_edges(draw, info['edges'], cell_size)
+        draw_text(draw, info['region'], cell_size, str(info[key]))
+
+    draw_text2(draw, (cols - 1) * cell_size // 2, 30, title)
+
+    return img
 
-def part1():
-    world = parse_input('my_input.txt')
-    regions = find_regions(world)
 
+def render_regions(world, regions, workers=None):
     cell_size = 10
     rows = max(r for r, _ in world) + 1
     cols = max(c for _, c in world) + 1
 
-    max_values = {
-        'area': max(r['area'] for r in regions),
-        'perim': max(r['perim'] for r in regions),
-        'sides': max(r['sides'] for r in regions)
-    }
+    # the workers only need the cells and metrics of each region
+    scene = rows, cols, cell_size, [{key: info[key] for key in ('region', 'edges', 'area', 'perim', 'sides')}
+                                    for info in regions]
 
-    img_area, img_perim, img_sides, draw_area, draw_perim, draw_sides = setup_images(rows, cols, cell_size)
+    report = progress(len(METRICS))
 
-    last_progress = 0
-    regions_count = len(regions)
+    images = render_frames(draw_metric, METRICS, scene, min(workers or os.cpu_count() or 1, len(METRICS)))
+    for i, ((*_, filename), img) in enumerate(zip(METRICS, images)):
+        img.save(filename)
+        report.update(i)
 
-    for i, info in enumerate(regions):
-        process_region(info, draw_area, draw_perim, draw_sides, cell_size, max_values)
+    report.close()
 
-        progress = i * 100 // regions_count
-        if progress != last_progress:
-            print(f'Progress: {progress}%', end='\r', flush=True)
-            last_progress = progress
 
-    print('\r\033[2K', end='\r')
+def part1(filename='my_input.txt', render=True, workers=None):
+    world = parse_input(filename)
+    regions = find_regions(world)
 
-    y = 30
-    x = max(c for _, c in world) * cell_size // 2
+    if render:
+        render_regions(world, regions, workers)
 
-    draw_text2(draw_area, x, y, 'areas of regions')
-    draw_text2(draw_perim, x, y, 'perimeters of regions')
-    draw_text2(draw_sides, x, y, 'number of sides in regions')
+    total_cost = sum(info['price1'] for info in regions)
+    print(f'Answer: {total_cost}')
+    return total_cost
+
+
+def part2(filename='my_input.txt', render=True, workers=None):
+    world = parse_input(filename)
+    regions = find_regions(world)
 
-    img_area.save('day11_area.png')
-    img_perim.save('day11_perim.png')
-    img_sides.save('day11_sides.png')
+    if render:
+        render_regions(world, regions, workers)
 
+    total_cost = sum(info['price2'] for info in regions)
     print(f'Answer: {total_cost}')
+    return total_cost
 
 
 if __name__ == '__main__':
-    part1()
+    render = '--headless' not in sys.argv
+    part1(render=render)
+    part2(render=render)
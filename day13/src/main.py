@@ -1,5 +1,13 @@
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.cache import cached_parser
+from aoc.progress import progress
+
+
+@cached_parser()
 def parse_input(filename):
     return [
         (a1, b1, p1, a2, b2, p2)
@@ -22,8 +30,10 @@ def solve_system(a1, b1, p1, a2, b2, p2):
 
     return (x, y) if x >= 0 and y >= 0 else None
 
-def part1():
-    machines, total_cost = parse_input('my_input.txt'), 0
+def part1(filename='my_input.txt'):
+    machines, total_cost = parse_input(filename), 0
+
+    report = progress(len(machines))
 
     for i, (a1, b1, p1, a2, b2, p2) in enumerate(machines, 1):
         solution = solve_system(a1, b1, p1, a2, b2, p2)
@@ -31,28 +41,32 @@ def part1():
         if solution:
             total_cost += solution[0] * 3 + solution[1]
 
-        print(f'Progress: {i * 100 // len(machines)}%', end='\r', flush=True)
+        report.update(i)
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     print(f'Answer: {total_cost}')
+    return total_cost
 
-def part2():
-    machines, total_cost = parse_input('my_input.txt'), 0
+def part2(filename='my_input.txt'):
+    machines, total_cost = parse_input(filename), 0
 
     offset = 10_000_000_000_000
 
+    report = progress(len(machines))
+
     for i, (a1, b1, p1, a2, b2, p2) in enumerate(machines, 1):
         solution = solve_system(a1, b1, p1 + offset, a2, b2, p2 + offset)
 
         if solution:
             total_cost += solution[0] * 3 + solution[1]
 
-        print(f'Progress: {i * 100 // len(machines)}%', end='\r', flush=True)
+        report.update(i)
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     print(f'Answer: {total_cost}')
+    return total_cost
 
 def main():
     part1()
@@ -1,8 +1,14 @@
+import math
+import sys
 from pathlib import Path
 
-import math
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.cache import cached_parser
+from aoc.progress import progress
 
 
+@cached_parser()
 def parse_input(filename):
     positions, velocities = [], []
 
@@ -53,53 +59,55 @@ def compute_safety_factor(positions, width, height):
     return math.prod(quadrants)
 
 
-def part1():
-    positions, velocities = parse_input('my_input.txt')
+def part1(filename='my_input.txt', width=101, height=103):
+    positions, velocities = parse_input(filename)
 
-    width, height = 101, 103
     steps = 100
 
     final_positions = simulate_positions(positions, velocities, width, height, steps)
     result = compute_safety_factor(final_positions, width, height)
 
     print(f'Answer: {result}')
+    return result
 
 
-def part2():
-    positions, velocities = parse_input('my_input.txt')
+def part2(filename='my_input.txt', width=101, height=103):
+    positions, velocities = parse_input(filename)
 
-    width, height = 101, 103
     last_entropy, last_steps = float('inf'), 0
+    report = progress()
 
     for steps in range(10_000):
         new_positions = simulate_positions(positions, velocities, width, height, steps)
         entropy = calculate_entropy(new_positions, width, height)
-        print(f'Progress: steps={steps}, entropy={entropy}', end='\r', flush=True)
+        report.update(steps=steps, entropy=entropy)
 
         if entropy < last_entropy:
             last_entropy, last_steps = entropy, steps
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     print(f'Answer: {last_steps}')
+    return last_steps
 
 
-def part3():
-    positions, velocities = parse_input('my_input.txt')
+def part3(filename='my_input.txt', width=101, height=103):
+    positions, velocities = parse_input(filename)
 
-    width, height = 101, 103
     last_largest_cluster, last_steps = 0, 0
+    report = progress()
 
     for steps in range(10_000):
         new_positions = simulate_positions(positions, velocities, width, height, steps)
         largest_cluster = calculate_largest_cluster(new_positions, width, height)
-        print(f'Progress: steps={steps}, largest_cluster={largest_cluster}', end='\r', flush=True)
+        report.update(steps=steps, largest_cluster=largest_cluster)
 
         if largest_cluster > last_largest_cluster:
             last_largest_cluster, last_steps = largest_cluster, steps
 
-    print('\r\033[2K', end='\r')
+    report.close()
     print(f'Answer: {last_steps}')
+    return last_steps
 
 
 if __name__ == '__main__':
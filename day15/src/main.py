@@ -1,92 +1,107 @@
+import sys
+from collections import deque
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.cache import cached_parser
+from aoc.grid import Grid
+from aoc.progress import progress
+
 DIRECTIONS = {'^': (-1, 0), 'v': (1, 0), '<': (0, -1), '>': (0, 1)}
 
 TRANSLATE = {'#': '##', 'O': '[]', '.': '..', '@': '@.'}
 
+WALL, EMPTY, BOX, BOX_LEFT, BOX_RIGHT = map(ord, '#.O[]')
 
+
+@cached_parser()
 def parse_input(filename, is_wide=False):
     lines = Path(filename).read_text().strip().splitlines()
     layout = []
     moves = ''
-    robot_pos = None
-    boxes = set()
 
     for line in lines:
         if line.startswith('#'):
-            layout.append(list(''.join(TRANSLATE[char] if is_wide else char for char in line)))
+            layout.append(''.join(TRANSLATE[char] if is_wide else char for char in line))
         elif line.startswith(tuple(DIRECTIONS.keys())):
             moves += line.strip()
 
-    for r, row in enumerate(layout):
-        for c, char in enumerate(row):
-            if char == '@':
-                robot_pos = (r, c)
-                layout[r][c] = '.'
-            elif char == 'O':
-                boxes.add(frozenset([(r, c)]))
-                layout[r][c] = '.'
-            elif char == '[':
-                boxes.add(frozenset([(r, c), (r, c + 1)]))
-                layout[r][c] = layout[r][c + 1] = '.'
+    # boxes live in the grid itself, the robot is tracked separately by its index
+    grid = Grid.from_lines(layout)
+    robot_pos = grid.find('@')
+    grid[robot_pos] = EMPTY
 
-    return layout, robot_pos, boxes, moves
+    return grid, robot_pos, moves
 
 
-from collections import deque
+def move(grid, robot_pos, step):
+    cells = grid.cells
+    target = robot_pos + step
 
+    if cells[target] == WALL:
+        return robot_pos
 
-def move(layout, boxes, r, c, dr, dc):
-    rows, cols = len(layout), len(layout[0])
-    target_r, target_c = r + dr, c + dc
+    queue, moved = deque([target]), set()
 
-    if target_r < 0 or target_r >= rows or target_c < 0 or target_c >= cols or layout[target_r][target_c] == '#':
-        return r, c
+    while queue:
+        pos = queue.popleft()
 
-    queue, moved = deque([(target_r, target_c)]), set()
+        if pos in moved or cells[pos] == EMPTY:
+            continue
 
-    while queue:
-        curr_r, curr_c = queue.popleft()
-        for box in {b for b in boxes if (curr_r, curr_c) in b and b not in moved}:
-            new_positions = {(br + dr, bc + dc) for br, bc in box}
-            if any(nr < 0 or nr >= rows or nc < 0 or nc >= cols or layout[nr][nc] == '#' for nr, nc in new_positions):
-                return r, c
-            queue.extend(new_positions - {(curr_r, curr_c)})
-            moved.add(box)
+        if cells[pos] == WALL:
+            return robot_pos
+
+        moved.add(pos)
+        queue.append(pos + step)
+
+        # a wide box pushed up or down drags its other half along
+        if cells[pos] == BOX_LEFT and step not in (1, -1):
+            queue.append(pos + 1)
+        elif cells[pos] == BOX_RIGHT and step not in (1, -1):
+            queue.append(pos - 1)
+
+    # shift the furthest cells first so nothing is overwritten before it moves
+    for pos in sorted(moved, reverse=step > 0):
+        cells[pos + step], cells[pos] = cells[pos], EMPTY
 
-    if moved:
-        boxes.difference_update(moved)
-        boxes.update(frozenset((br + dr, bc + dc) for br, bc in box) for box in moved)
+    return target
 
-    return target_r, target_c
 
+def execute(grid, robot_pos, moves):
+    steps = {move_dir: grid.offset(dr, dc) for move_dir, (dr, dc) in DIRECTIONS.items()}
+    report = progress(len(moves))
 
-def execute(layout, robot_pos, boxes, moves):
     for i, move_dir in enumerate(moves):
-        if i % (len(moves) // 100 or 1) == 0:
-            print(f'Progress {i * 100 // len(moves)}%', end='\r', flush=True)
+        report.update(i)
 
-        robot_pos = move(layout, boxes, *robot_pos, *DIRECTIONS[move_dir])
+        robot_pos = move(grid, robot_pos, steps[move_dir])
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
-    return robot_pos, boxes
+    return robot_pos
 
 
-def calculate_gps(boxes):
-    return sum(100 * min(r for r, _ in box) + min(c for _, c in box) for box in boxes)
+def calculate_gps(grid):
+    positions = (grid.position(i) for i in grid.indices() if grid[i] in (BOX, BOX_LEFT))
+    return sum(100 * r + c for r, c in positions)
 
 
-def part1():
-    layout, robot_pos, boxes, moves = parse_input('my_input.txt', is_wide=False)
-    robot_pos, boxes = execute(layout, robot_pos, boxes, moves)
-    print(f'Answer: {calculate_gps(boxes)}')
+def part1(filename='my_input.txt'):
+    grid, robot_pos, moves = parse_input(filename, is_wide=False)
+    execute(grid, robot_pos, moves)
+    result = calculate_gps(grid)
+    print(f'Answer: {result}')
+    return result
 
 
-def part2():
-    layout, robot_pos, boxes, moves = parse_input('my_input.txt', is_wide=True)
-    robot_pos, boxes = execute(layout, robot_pos, boxes, moves)
-    print(f'Answer: {calculate_gps(boxes)}')
+def part2(filename='my_input.txt'):
+    grid, robot_pos, moves = parse_input(filename, is_wide=True)
+    execute(grid, robot_pos, moves)
+    result = calculate_gps(grid)
+    print(f'Answer: {result}')
+    return result
 
 
 if __name__ == '__main__':
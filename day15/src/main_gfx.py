@@ -1,9 +1,17 @@
+import sys
 from pathlib import Path
 
-from PIL import Image, ImageDraw, ImageFont
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.gfx import DeltaRaster, frame_sink
+from aoc.progress import progress
 
 DIRECTIONS = {'^': (-1, 0), 'v': (1, 0), '<': (0, -1), '>': (0, 1)}
 
+# warehouse colours, a wide box is drawn in two halves
+COLORS = ('black', 'gray', 'cyan', 'blue', 'green', 'red')
+FLOOR, WALL, BOX, BOX_LEFT, BOX_RIGHT, ROBOT = range(len(COLORS))
+
 TRANSLATE = {'#': '##', 'O': '[]', '.': '..', '@': '@.'}
 
 
@@ -38,31 +46,24 @@ def parse_input(filename, is_wide=False):
 from collections import deque
 
 
-def draw_image(layout, robot_pos, boxes, move_dir, is_wide):
-    r_size, c_size = (5, 5)
-    rows, cols = len(layout), len(layout[0])
-    img = Image.new('RGB', (cols * r_size, rows * c_size), color='black')
-    draw = ImageDraw.Draw(img)
-    font = ImageFont.truetype('arialbd.ttf', r_size)
+def warehouse_raster(layout, robot_pos, boxes, pixel_size=5):
+    import numpy as np
 
-    for r, row in enumerate(layout):
-        for c, char in enumerate(row):
-            x0, y0 = c * c_size, r * r_size
-            x1, y1 = x0 + c_size, y0 + r_size
+    walls = np.array(layout) == '#'
+    raster = DeltaRaster(len(layout), len(layout[0]), COLORS, pixel_size).paint_mask(walls, WALL)
+    draw_boxes(raster, boxes)
+    raster.set([robot_pos], ROBOT)
+    return raster
 
-            if char == '#':
-                draw.rectangle([x0, y0, x1, y1], fill='gray')
-            elif frozenset([(r, c)]) in boxes:
-                draw.rectangle([x0, y0, x1, y1], fill='cyan')
-            elif frozenset([(r, c), (r, c + 1)]) in boxes:
-                draw.rectangle([x0, y0, x1, y1], fill='blue')
-            elif frozenset([(r, c - 1), (r, c)]) in boxes:
-                draw.rectangle([x0, y0, x1, y1], fill='green')
-            elif (r, c) == robot_pos:
-                draw.ellipse([x0, y0, x1, y1], fill='red')
 
-    draw.text((r_size, c_size), move_dir, fill='white', font=font)
-    return img
+def draw_boxes(raster, boxes):
+    for box in boxes:
+        if len(box) == 1:
+            raster.set(box, BOX)
+        else:
+            left, right = sorted(box)
+            raster.set([left], BOX_LEFT)
+            raster.set([right], BOX_RIGHT)
 
 
 def move(layout, boxes, r, c, dr, dc):
@@ -70,7 +71,7 @@ def move(layout, boxes, r, c, dr, dc):
     target_r, target_c = r + dr, c + dc
 
     if target_r < 0 or target_r >= rows or target_c < 0 or target_c >= cols or layout[target_r][target_c] == '#':
-        return r, c
+        return (r, c), set()
 
     queue, moved = deque([(target_r, target_c)]), set()
 
@@ -79,7 +80,7 @@ def move(layout, boxes, r, c, dr, dc):
         for box in {b for b in boxes if (curr_r, curr_c) in b and b not in moved}:
             new_positions = {(br + dr, bc + dc) for br, bc in box}
             if any(nr < 0 or nr >= rows or nc < 0 or nc >= cols or layout[nr][nc] == '#' for nr, nc in new_positions):
-                return r, c
+                return (r, c), set()
             queue.extend(new_positions - {(curr_r, curr_c)})
             moved.add(box)
 
@@ -87,31 +88,33 @@ def move(layout, boxes, r, c, dr, dc):
         boxes.difference_update(moved)
         boxes.update(frozenset((br + dr, bc + dc) for br, bc in box) for box in moved)
 
-    return target_r, target_c
+    # the boxes that moved, at their old positions
+    return (target_r, target_c), moved
 
 
-def execute(layout, robot_pos, boxes, moves, is_wide):
-    img = draw_image(layout, robot_pos, boxes, '', is_wide)
-    images = [img]
+def execute(layout, robot_pos, boxes, moves, is_wide, render=True):
+    sink = frame_sink(f'warehouse_robot_{'part2' if is_wide else 'part1'}.gif', render, duration=0)
+    raster = warehouse_raster(layout, robot_pos, boxes) if render else None
+    sink.add(lambda: raster.patch())
+    report = progress(len(moves))
 
     for i, move_dir in enumerate(moves):
-        if i % (len(moves) // 100 or 1) == 0:
-            print(f'Progress {i * 100 // len(moves)}%', end='\r', flush=True)
+        report.update(i)
 
-        robot_pos = move(layout, boxes, *robot_pos, *DIRECTIONS[move_dir])
+        dr, dc = DIRECTIONS[move_dir]
+        new_pos, moved = move(layout, boxes, *robot_pos, dr, dc)
 
-        img = draw_image(layout, robot_pos, boxes, move_dir, is_wide)
-        images.append(img)
+        # only the robot and the boxes it pushed are redrawn, the next kept frame patches just those cells
+        if render:
+            raster.clear([robot_pos, *(cell for box in moved for cell in box)])
+            draw_boxes(raster, (frozenset((br + dr, bc + dc) for br, bc in box) for box in moved))
+            raster.set([new_pos], ROBOT)
 
-    print('\r\033[2K', end='\r')
+        robot_pos = new_pos
+        sink.add(lambda: raster.patch())
 
-    images[0].save(
-        f'warehouse_robot_{'part2' if is_wide else 'part1'}.gif',
-        save_all=True,
-        append_images=images[1:],
-        duration=0,
-        loop=0,
-    )
+    report.close()
+    sink.close()
 
     return robot_pos, boxes
 
@@ -120,18 +123,23 @@ def calculate_gps(boxes):
     return sum(100 * min(r for r, _ in box) + min(c for _, c in box) for box in boxes)
 
 
-def part1():
-    layout, robot_pos, boxes, moves = parse_input('my_input.txt', is_wide=False)
-    robot_pos, boxes = execute(layout, robot_pos, boxes, moves)
-    print(f'Answer: {calculate_gps(boxes)}')
+def part1(filename='my_input.txt', render=True):
+    layout, robot_pos, boxes, moves = parse_input(filename, is_wide=False)
+    robot_pos, boxes = execute(layout, robot_pos, boxes, moves, is_wide=False, render=render)
+    result = calculate_gps(boxes)
+    print(f'Answer: {result}')
+    return result
 
 
-def part2():
-    layout, robot_pos, boxes, moves = parse_input('my_input.txt', is_wide=True)
-    robot_pos, boxes = execute(layout, robot_pos, boxes, moves)
-    print(f'Answer: {calculate_gps(boxes)}')
+def part2(filename='my_input.txt', render=True):
+    layout, robot_pos, boxes, moves = parse_input(filename, is_wide=True)
+    robot_pos, boxes = execute(layout, robot_pos, boxes, moves, is_wide=True, render=render)
+    result = calculate_gps(boxes)
+    print(f'Answer: {result}')
+    return result
 
 
 if __name__ == '__main__':
-    part1()
-    part2()
+    render = '--headless' not in sys.argv
+    part1(render=render)
+    part2(render=render)
@@ -1,98 +1,69 @@
-from heapq import heappop, heappush
+import sys
 from pathlib import Path
 
-DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-
-
-def parse_input(filename):
-    maze = Path(filename).read_text().strip().splitlines()
-    start = end = None
-    for r, row in enumerate(maze):
-        if 'S' in row:
-            start = (r, row.index('S'))
-        if 'E' in row:
-            end = (r, row.index('E'))
-        if start and end:
-            break
-    return maze, start, end
-
-
-def dijkstra_lowest_cost(maze, start, end):
-    rows, cols = len(maze), len(maze[0])
-    heap = [(0, start[0], start[1], 0)]
-    visited = {}
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-    while heap:
-        cost, r, c, direction = heappop(heap)
+from aoc.cache import cached_parser
+from aoc.grid import PAD, Grid
+from aoc.search import bucket_search
 
-        if visited.get((r, c, direction), float('inf')) <= cost:
-            continue
-
-        visited[(r, c, direction)] = cost
-
-        if (r, c) == end:
-            return cost
-
-        nr, nc = r + DIRECTIONS[direction][0], c + DIRECTIONS[direction][1]
-        if 0 <= nr < rows and 0 <= nc < cols and maze[nr][nc] != '#':
-            heappush(heap, (cost + 1, nr, nc, direction))
-
-        for new_dir in (direction - 1) % 4, (direction + 1) % 4:
-            heappush(heap, (cost + 1000, r, c, new_dir))
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
 
-    return float('inf')
+WALL = ord('#')
+TURN_COST = 1000
 
 
-def dijkstra_best_paths(maze, start, end):
-    rows, cols = len(maze), len(maze[0])
-    heap = [(0, start[0], start[1], 0, [start])]
-    visited = {}
+@cached_parser()
+def parse_input(filename):
+    maze = Grid.from_file(filename)
+    return maze, maze.find('S'), maze.find('E')
 
-    best_cost = float('inf')
-    best_paths = []
 
-    while heap:
-        cost, r, c, direction, path = heappop(heap)
+def search_maze(maze, start, end, all_preds=False):
+    # states are position * 4 + direction, the reindeer starts facing east
+    cells, steps = maze.cells, [maze.offset(dr, dc) for dr, dc in DIRECTIONS]
 
-        if cost > best_cost:
-            continue
+    def neighbors(state):
+        pos, direction = divmod(state, 4)
+        facing = pos * 4
+        moves = [(facing + (direction - 1) % 4, TURN_COST), (facing + (direction + 1) % 4, TURN_COST)]
+        if cells[pos + steps[direction]] not in (PAD, WALL):
+            moves.append((state + 4 * steps[direction], 1))
+        return moves
 
-        if visited.get((r, c, direction), float('inf')) < cost:
-            continue
+    ends = [end * 4 + direction for direction in range(4)]
+    result = bucket_search([start * 4], neighbors, len(cells) * 4, TURN_COST, targets=ends, all_preds=all_preds)
+    best_cost = min(result.dist[state] for state in ends)
 
-        visited[(r, c, direction)] = cost
+    return result, [state for state in ends if result.dist[state] == best_cost], best_cost
 
-        if (r, c) == end:
-            if cost < best_cost:
-                best_cost = cost
-            best_paths.append(path)
-            continue
 
-        nr, nc = r + DIRECTIONS[direction][0], c + DIRECTIONS[direction][1]
-        if 0 <= nr < rows and 0 <= nc < cols and maze[nr][nc] != '#':
-            heappush(heap, (cost + 1, nr, nc, direction, path + [(nr, nc)]))
+def dijkstra_lowest_cost(maze, start, end):
+    _, _, best_cost = search_maze(maze, start, end)
+    return best_cost
 
-        for new_dir in (direction - 1) % 4, (direction + 1) % 4:
-            heappush(heap, (cost + 1000, r, c, new_dir, path))
 
-    return best_paths
+def best_path_tiles(maze, start, end):
+    result, best_ends, _ = search_maze(maze, start, end, all_preds=True)
+    return {state // 4 for state in result.on_optimal_paths(best_ends)}
 
 
-def part1():
-    maze, start, end = parse_input('my_input.txt')
+def part1(filename='my_input.txt'):
+    maze, start, end = parse_input(filename)
 
     best_cost = dijkstra_lowest_cost(maze, start, end)
 
     print(f'Answer: {best_cost}')
+    return best_cost
 
 
-def part2():
-    maze, start, end = parse_input('my_input.txt')
+def part2(filename='my_input.txt'):
+    maze, start, end = parse_input(filename)
 
-    best_paths = dijkstra_best_paths(maze, start, end)
-    result = len(set(tile for path in best_paths for tile in path))
+    result = len(best_path_tiles(maze, start, end))
 
     print(f'Answer: {result}')
+    return result
 
 
 if __name__ == '__main__':
@@ -1,11 +1,22 @@
+import sys
 from collections import defaultdict
 from heapq import heappop, heappush
 from pathlib import Path
 
-from PIL import Image, ImageDraw, ImageFont
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.gfx import Raster, frame_sink
 
 DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
 
+# draw_maze colours, the walls are painted once per maze and everything else is overlaid per frame
+COLORS = ('black', 'gray', 'cyan', 'white', 'red', 'blue')
+FLOOR, WALL, BEST, PATH, START, END = range(len(COLORS))
+
+# the searches visit far more paths than anyone wants to watch, and each new one is offered to the sink as a frame.
+# Once the sink has taken this many, paths are neither offered nor remembered in `drawn`, so memory stops growing
+MAX_FRAMES = 2000
+
 
 def parse_input(filename):
     maze = Path(filename).read_text().strip().splitlines()
@@ -20,39 +31,21 @@ def parse_input(filename):
     return maze, start, end
 
 
-def draw_maze(maze, start, end, path, all_paths=[], pixel_size=5, text=None):
-    rows, cols = len(maze), len(maze[0])
-    img = Image.new('RGB', (cols * pixel_size, rows * pixel_size), 'black')
-    draw = ImageDraw.Draw(img)
+def maze_raster(maze, pixel_size=5):
+    import numpy as np
 
-    for r, row in enumerate(maze):
-        for c, cell in enumerate(row):
-            x0, y0 = c * pixel_size, r * pixel_size
-            x1, y1 = x0 + pixel_size, y0 + pixel_size
-            if cell == '#':
-                draw.rectangle([x0, y0, x1, y1], fill='gray')
-
-    for r, c in all_paths:
-        x0, y0 = c * pixel_size, r * pixel_size
-        x1, y1 = x0 + pixel_size, y0 + pixel_size
-        draw.rectangle([x0, y0, x1, y1], fill='cyan')
-
-    for r, c in path:
-        x0, y0 = c * pixel_size, r * pixel_size
-        x1, y1 = x0 + pixel_size, y0 + pixel_size
-        draw.rectangle([x0, y0, x1, y1], fill='white')
-
-    sx0, sy0 = start[1] * pixel_size, start[0] * pixel_size
-    sx1, sy1 = sx0 + pixel_size, sy0 + pixel_size
-    draw.rectangle([sx0, sy0, sx1, sy1], fill='red')
-
-    ex0, ey0 = end[1] * pixel_size, end[0] * pixel_size
-    ex1, ey1 = ex0 + pixel_size, ey0 + pixel_size
-    draw.rectangle([ex0, ey0, ex1, ey1], fill='blue')
+    walls = np.array([list(row) for row in maze]) == '#'
+    return Raster(len(maze), len(maze[0]), COLORS, pixel_size).paint_mask(walls, WALL)
+
+
+def draw_maze(raster, start, end, path, all_paths=[], text=None):
+    img = raster.render((all_paths, BEST), (path, PATH), ([start], START), ([end], END))
 
     if text:
+        from PIL import ImageDraw, ImageFont
+
         font = ImageFont.truetype('arialbd.ttf', 30)
-        draw.text((15, 5), text, fill='white', font=font)
+        ImageDraw.Draw(img).text((15, 5), text, fill='white', font=font)
 
     return img
 
@@ -83,7 +76,7 @@ def dijkstra_lowest_cost(maze, start, end):
     return float('inf')
 
 
-def dijkstra_best_paths(maze, start, end):
+def dijkstra_best_paths(maze, start, end, render=True):
     rows, cols = len(maze), len(maze[0])
     heap = [(0, start[0], start[1], 0, [start])]
     visited = {}
@@ -91,7 +84,9 @@ def dijkstra_best_paths(maze, start, end):
     best_cost = float('inf')
     best_paths = []
 
-    images = [draw_maze(maze, start, end, [])]
+    raster = maze_raster(maze) if render else None
+    sink = frame_sink('maze_dijkstra.gif', render, max_frames=MAX_FRAMES)
+    sink.add(lambda: draw_maze(raster, start, end, []), force=True)
     drawn = set()
 
     while heap:
@@ -105,9 +100,9 @@ def dijkstra_best_paths(maze, start, end):
 
         visited[(r, c, direction)] = cost
 
-        if tuple(path) not in drawn:
-            images.append(draw_maze(maze, start, end, path))
+        if not sink.done() and tuple(path) not in drawn:
             drawn.add(tuple(path))
+            sink.add(lambda: draw_maze(raster, start, end, path))
 
         if (r, c) == end:
             if cost < best_cost:
@@ -122,18 +117,12 @@ def dijkstra_best_paths(maze, start, end):
         for new_dir in (direction - 1) % 4, (direction + 1) % 4:
             heappush(heap, (cost + 1000, r, c, new_dir, path))
 
-    images[0].save(
-        f'maze_dijkstra.gif',
-        save_all=True,
-        append_images=images[1:],
-        duration=100,
-        loop=0,
-    )
+    sink.close()
 
     return best_paths
 
 
-def a_star_best_paths(maze, start, end):
+def a_star_best_paths(maze, start, end, render=True):
     def heuristic1(a, b):
         return (a[0] - b[0]) * (a[0] - b[0]) + (a[1] - b[1]) * (a[1] - b[1])
 
@@ -150,7 +139,9 @@ def a_star_best_paths(maze, start, end):
     best_cost = float('inf')
     best_paths = []
 
-    images = [draw_maze(maze, start, end, [])]
+    raster = maze_raster(maze) if render else None
+    sink = frame_sink('maze_astar.gif', render, max_frames=MAX_FRAMES)
+    sink.add(lambda: draw_maze(raster, start, end, []), force=True)
     drawn = set()
 
     while heap:
@@ -164,9 +155,9 @@ def a_star_best_paths(maze, start, end):
 
         visited[(r, c, direction)] = cost
 
-        if tuple(path) not in drawn:
-            images.append(draw_maze(maze, start, end, path))
+        if not sink.done() and tuple(path) not in drawn:
             drawn.add(tuple(path))
+            sink.add(lambda: draw_maze(raster, start, end, path))
 
         if (r, c) == end:
             if cost < best_cost:
@@ -183,18 +174,12 @@ def a_star_best_paths(maze, start, end):
         for new_dir in [(direction - 1) % 4, (direction + 1) % 4]:
             heappush(heap, (heuristic2((r, c), start), cost + 1000, r, c, new_dir, path))
 
-    images[0].save(
-        f'maze_astar.gif',
-        save_all=True,
-        append_images=images[1:],
-        duration=100,
-        loop=0,
-    )
+    sink.close()
 
     return best_paths
 
 
-def dfs_best_paths(maze, start, end):
+def dfs_best_paths(maze, start, end, render=True):
     rows, cols = len(maze), len(maze[0])
     best_cost = float('inf')
 
@@ -202,7 +187,9 @@ def dfs_best_paths(maze, start, end):
     visited = set()
     paths = defaultdict(list)
 
-    images = [draw_maze(maze, start, end, [])]
+    raster = maze_raster(maze) if render else None
+    sink = frame_sink('maze_dfs.gif', render, max_frames=MAX_FRAMES)
+    sink.add(lambda: draw_maze(raster, start, end, []), force=True)
     drawn = set()
 
     while stack:
@@ -216,9 +203,9 @@ def dfs_best_paths(maze, start, end):
         if cost > best_cost:
             continue
 
-        if tuple(path) not in drawn:
-            images.append(draw_maze(maze, start, end, path))
+        if not sink.done() and tuple(path) not in drawn:
             drawn.add(tuple(path))
+            sink.add(lambda: draw_maze(raster, start, end, path))
 
         if (r, c) == end:
             paths[cost].append(path)
@@ -231,18 +218,12 @@ def dfs_best_paths(maze, start, end):
                 new_path = path + [(nr, nc)]
                 stack.append((nr, nc, i, new_cost, new_path))
 
-    images[0].save(
-        f'maze_dfs.gif',
-        save_all=True,
-        append_images=images[1:],
-        duration=100,
-        loop=0,
-    )
+    sink.close()
 
     return paths[min(paths)]
 
 
-def bfs_best_paths(maze, start, end):
+def bfs_best_paths(maze, start, end, render=True):
     rows, cols = len(maze), len(maze[0])
     best_cost = float('inf')
 
@@ -250,7 +231,9 @@ def bfs_best_paths(maze, start, end):
     visited = set()
     paths = defaultdict(list)
 
-    images = [draw_maze(maze, start, end, [])]
+    raster = maze_raster(maze) if render else None
+    sink = frame_sink('maze_bfs.gif', render, max_frames=MAX_FRAMES)
+    sink.add(lambda: draw_maze(raster, start, end, []), force=True)
     drawn = set()
 
     while stack:
@@ -264,9 +247,9 @@ def bfs_best_paths(maze, start, end):
         if cost > best_cost:
             continue
 
-        if tuple(path) not in drawn:
-            images.append(draw_maze(maze, start, end, path))
+        if not sink.done() and tuple(path) not in drawn:
             drawn.add(tuple(path))
+            sink.add(lambda: draw_maze(raster, start, end, path))
 
         if (r, c) == end:
             paths[cost].append(path)
@@ -279,53 +262,43 @@ def bfs_best_paths(maze, start, end):
                 new_path = path + [(nr, nc)]
                 stack.append((nr, nc, i, new_cost, new_path))
 
-    images[0].save(
-        f'maze_bfs.gif',
-        save_all=True,
-        append_images=images[1:],
-        duration=100,
-        loop=0,
-    )
+    sink.close()
 
     return paths[min(paths)]
 
 
-def part1():
-    maze, start, end = parse_input('my_input.txt')
+def part1(filename='my_input.txt', render=True):
+    maze, start, end = parse_input(filename)
 
     best_cost = dijkstra_lowest_cost(maze, start, end)
 
-    img = draw_maze(maze, start, end, [])
-    img.save('maze.png')
+    if render:
+        raster = maze_raster(maze)
+        img = draw_maze(raster, start, end, [])
+        img.save('maze.png')
 
     print(f'Answer: {best_cost}')
+    return best_cost
 
 
-def part2():
-    maze, start, end = parse_input('my_input.txt')
+def part2(filename='my_input.txt', render=True):
+    maze, start, end = parse_input(filename)
 
     for func in (dijkstra_best_paths, a_star_best_paths, dfs_best_paths, bfs_best_paths):
-        best_paths = func(maze, start, end)
+        best_paths = func(maze, start, end, render)
 
     all_paths = set(tile for path in best_paths for tile in path)
 
-    images = []
-
-    for i, path in enumerate(best_paths, start=1):
-        img = draw_maze(maze, start, end, path, all_paths=all_paths, text=str(i))
-        images.append(img)
-
-    images[0].save(
-        f'maze_paths_test.gif',
-        save_all=True,
-        append_images=images[1:],
-        duration=100,
-        loop=0,
-    )
+    raster = maze_raster(maze) if render else None
+    with frame_sink('maze_paths_test.gif', render) as sink:
+        for i, path in enumerate(best_paths, start=1):
+            sink.add(lambda: draw_maze(raster, start, end, path, all_paths=all_paths, text=str(i)))
 
-    print(f'Answer: {len(set(tile for path in best_paths for tile in path))}')
+    print(f'Answer: {len(all_paths)}')
+    return len(all_paths)
 
 
 if __name__ == '__main__':
-    # part1()
-    part2()
+    render = '--headless' not in sys.argv
+    # part1(render=render)
+    part2(render=render)
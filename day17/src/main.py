@@ -1,6 +1,12 @@
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from aoc.cache import cached_parser
+
+
+@cached_parser()
 def parse_input(filename):
     lines = [line for line in Path(filename).read_text().strip().splitlines() if line.strip()]
     a = int(lines[0].split(":")[1].strip())
@@ -60,16 +66,17 @@ def run_program(registers, program):
     return output
 
 
-def part1():
-    registers, program = parse_input("my_input.txt")
+def part1(filename='my_input.txt'):
+    registers, program = parse_input(filename)
     result = run_program(registers, program)
     answer = ','.join(map(str, result))
 
     print(f"Answer: {answer}")
+    return answer
 
 
-def part2():
-    _, program = parse_input("my_input.txt")
+def part2(filename='my_input.txt'):
+    _, program = parse_input(filename)
     a, b, c = 1 << (3 * (len(program) - 1)), 0, 0
     result = [0] * len(program)
 
@@ -80,6 +87,7 @@ def part2():
                 result = run_program((a, b, c), program)
 
     print(f"Answer: {a}")
+    return a
 
 
 if __name__ == "__main__":
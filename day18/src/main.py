@@ -1,74 +1,71 @@
-from heapq import heappop, heappush
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def parse_input(filename):
-    return [tuple(map(int, line.split(','))) for line in Path(filename).read_text().strip().splitlines()]
-
+from aoc.cache import cached_parser
+from aoc.grid import Grid
+from aoc.progress import progress
+from aoc.search import bfs
 
-def find_shortest_path(grid, grid_size):
-    start = (0, 0)
-    target = (grid_size - 1, grid_size - 1)
-    directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+EMPTY, CORRUPTED = ord('.'), ord('#')
 
-    visited = [row[:] for row in grid]
-    priority_queue = [(0, start, [start])]
 
-    while priority_queue:
-        _, (x, y), path = heappop(priority_queue)
+@cached_parser()
+def parse_input(filename):
+    return [tuple(map(int, line.split(','))) for line in Path(filename).read_text().strip().splitlines()]
 
-        if (x, y) == target:
-            return path
 
-        if visited[y][x]:
-            continue
+def find_shortest_path(grid):
+    cells = grid.cells
+    start = grid.index(0, 0)
+    target = grid.index(grid.rows - 1, grid.cols - 1)
 
-        visited[y][x] = True
+    if cells[start] != EMPTY:
+        return []
 
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < grid_size and 0 <= ny < grid_size and not visited[ny][nx]:
-                heappush(priority_queue, (len(path), (nx, ny), path + [(nx, ny)]))
+    def neighbors(pos):
+        return [pos + step for step in grid.offsets4 if cells[pos + step] == EMPTY]
 
-    return []
+    return bfs([start], neighbors, len(cells), targets=[target]).path(target)
 
 
-def part1():
-    grid_list = parse_input('my_input.txt')
-    grid_size = 71
-    byte_limit = 1024
+def part1(filename='my_input.txt', grid_size=71, byte_limit=1024):
+    grid_list = parse_input(filename)
 
-    grid = [[False for _ in range(grid_size)] for _ in range(grid_size)]
+    grid = Grid(grid_size, grid_size)
     for x, y in grid_list[:byte_limit]:
-        grid[y][x] = True
+        grid[grid.index(y, x)] = CORRUPTED
 
-    path = find_shortest_path(grid, grid_size)
+    path = find_shortest_path(grid)
 
     print(f'Answer: {len(path) - 1}')
+    return len(path) - 1
 
 
-def part2():
-    grid_list = parse_input('my_input.txt')
-    grid_size = 71
+def part2(filename='my_input.txt', grid_size=71):
+    grid_list = parse_input(filename)
 
-    grid = [[False for _ in range(grid_size)] for _ in range(grid_size)]
-    path = find_shortest_path(grid, grid_size)
+    grid = Grid(grid_size, grid_size)
+    path = set(find_shortest_path(grid))
+    report = progress(len(grid_list))
 
     for i, (x, y) in enumerate(grid_list):
-        print(f'Progress: {i * 100 // len(grid_list)}%', end='\r', flush=True)
+        report.update(i)
 
-        grid[y][x] = True
+        grid[grid.index(y, x)] = CORRUPTED
 
         # only re-run simulation if new corrupted position affects the path
-        if (x, y) in path:
-            path = find_shortest_path(grid, grid_size)
+        if grid.index(y, x) in path:
+            path = set(find_shortest_path(grid))
 
             if not path:
                 break
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     print(f'Answer: {x},{y}')
+    return f'{x},{y}'
 
 
 if __name__ == '__main__':
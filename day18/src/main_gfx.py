@@ -1,7 +1,15 @@
+import sys
 from heapq import heappop, heappush
 from pathlib import Path
 
-from PIL import Image, ImageDraw
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.gfx import Raster, frame_sink
+from aoc.progress import progress
+
+# draw_grid colours, fallen bytes are painted into the raster as they land, everything else is overlaid per frame
+COLORS = ('black', 'gray', 'white', 'red', 'blue', 'magenta')
+FREE, CORRUPTED, PATH, START, END, NEW_BYTE = range(len(COLORS))
 
 
 def parse_input(filename):
@@ -35,43 +43,16 @@ def find_shortest_path(grid, grid_size):
     return []
 
 
-def draw_grid(grid, start, end, path, new_pixel=None, pixel_size=5):
-    rows, cols = len(grid), len(grid[0])
-    img = Image.new('RGB', (cols * pixel_size, rows * pixel_size), 'black')
-    draw = ImageDraw.Draw(img)
-
-    for y, row in enumerate(grid):
-        for x, cell in enumerate(row):
-            x0, y0 = x * pixel_size, y * pixel_size
-            x1, y1 = x0 + pixel_size, y0 + pixel_size
-            if cell:
-                draw.rectangle([x0, y0, x1, y1], fill='gray')
-
-    for x, y in path:
-        x0, y0 = x * pixel_size, y * pixel_size
-        x1, y1 = x0 + pixel_size, y0 + pixel_size
-        draw.rectangle([x0, y0, x1, y1], fill='white')
-
-    sx0, sy0 = start[0] * pixel_size, start[1] * pixel_size
-    sx1, sy1 = sx0 + pixel_size, sy0 + pixel_size
-    draw.rectangle([sx0, sy0, sx1, sy1], fill='red')
-
-    ex0, ey0 = end[0] * pixel_size, end[1] * pixel_size
-    ex1, ey1 = ex0 + pixel_size, ey0 + pixel_size
-    draw.rectangle([ex0, ey0, ex1, ey1], fill='blue')
-
+def draw_grid(raster, start, end, path, new_pixel=None):
+    overlays = [(path, PATH), ([start], START), ([end], END)]
     if new_pixel:
-        ex0, ey0 = new_pixel[0] * pixel_size, new_pixel[1] * pixel_size
-        ex1, ey1 = ex0 + pixel_size, ey0 + pixel_size
-        draw.rectangle([ex0, ey0, ex1, ey1], fill='magenta')
+        overlays.append(([new_pixel], NEW_BYTE))
 
-    return img
+    return raster.render(*overlays)
 
 
-def part1():
-    grid_list = parse_input('my_input.txt')
-    grid_size = 71
-    byte_limit = 1024
+def part1(filename='my_input.txt', grid_size=71, byte_limit=1024, render=True):
+    grid_list = parse_input(filename)
 
     grid = [[False for _ in range(grid_size)] for _ in range(grid_size)]
     for x, y in grid_list[:byte_limit]:
@@ -80,42 +61,43 @@ def part1():
     path = find_shortest_path(grid, grid_size)
 
     print(f'Answer: {len(path) - 1}')
+    return len(path) - 1
 
 
-def part2():
-    grid_list = parse_input('my_input.txt')
-    grid_size = 71
+def part2(filename='my_input.txt', grid_size=71, render=True):
+    grid_list = parse_input(filename)
+    end = (grid_size - 1, grid_size - 1)
 
     grid = [[False for _ in range(grid_size)] for _ in range(grid_size)]
     path = find_shortest_path(grid, grid_size)
-    images = [draw_grid(grid, (0, 0), (70, 70), path)]
+    raster = Raster(grid_size, grid_size, COLORS, pixel_size=5, xy=True) if render else None
+    sink = frame_sink('grid_paths.gif', render)
+    sink.add(lambda: draw_grid(raster, (0, 0), end, path))
+    report = progress(len(grid_list))
 
     for i, (x, y) in enumerate(grid_list):
-        print(f'Progress: {i * 100 // len(grid_list)}%', end='\r', flush=True)
+        report.update(i)
 
         grid[y][x] = True
+        if render:
+            raster.paint([(x, y)], CORRUPTED)
 
         # only re-run simulation if new corrupted position affects the path
         if (x, y) in path:
             path = find_shortest_path(grid, grid_size)
-            images.append(draw_grid(grid, (0, 0), (70, 70), path))
+            sink.add(lambda: draw_grid(raster, (0, 0), end, path))
 
             if not path:
                 break
 
-    print('\r\033[2K', end='\r')
-
-    images[0].save(
-        f'grid_paths.gif',
-        save_all=True,
-        append_images=images[1:],
-        duration=100,
-        loop=0,
-    )
+    report.close()
+    sink.close()
 
     print(f'Answer: {x},{y}')
+    return f'{x},{y}'
 
 
 if __name__ == '__main__':
-    part1()
-    part2()
+    render = '--headless' not in sys.argv
+    part1(render=render)
+    part2(render=render)
@@ -14,8 +14,8 @@ def count_segmentations(string, segments, memo={'': 1}):
     return count
 
 
-def part1():
-    data = Path('my_input.txt').read_text().strip()
+def part1(filename='my_input.txt'):
+    data = Path(filename).read_text().strip()
     patterns, designs = data.split('\n\n')
 
     patterns = patterns.split(', ')
@@ -24,10 +24,11 @@ def part1():
     possible_count = sum(count_segmentations(design, patterns) > 0 for design in designs)
 
     print(f'Answer: {possible_count}')
+    return possible_count
 
 
-def part2():
-    data = Path('my_input.txt').read_text().strip()
+def part2(filename='my_input.txt'):
+    data = Path(filename).read_text().strip()
     patterns, designs = data.split('\n\n')
 
     patterns = patterns.split(', ')
@@ -36,6 +37,7 @@ def part2():
     total_ways = sum(count_segmentations(design, patterns) for design in designs)
 
     print(f'Answer: {total_ways}')
+    return total_ways
 
 
 if __name__ == '__main__':
@@ -1,56 +1,42 @@
-from heapq import heappop, heappush
+import sys
 from pathlib import Path
 
-DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from aoc.cache import cached_parser
+from aoc.grid import PAD, Grid
+from aoc.progress import progress
+from aoc.search import bfs
 
-def parse_input(filename):
-    grid = list(map(list, Path(filename).read_text().strip().splitlines()))
-    start, end = None, None
-    for r, row in enumerate(grid):
-        if 'S' in row:
-            start = (r, row.index('S'))
-        if 'E' in row:
-            end = (r, row.index('E'))
-        if start and end:
-            break
-    return grid, start, end
-
-
-def find_shortest_path(grid, start, end):
-    rows, cols = len(grid), len(grid[0])
-    heap = [(0, start[0], start[1], [start])]
-    visited = {}
+WALL = ord('#')
 
-    while heap:
-        cost, r, c, path = heappop(heap)
 
-        if visited.get((r, c), float('inf')) < cost:
-            continue
+@cached_parser()
+def parse_input(filename):
+    grid = Grid.from_file(filename)
+    return grid, grid.find('S'), grid.find('E')
 
-        visited[(r, c)] = cost
 
-        if (r, c) == end:
-            return path
+def find_shortest_path(grid, start, end):
+    cells = grid.cells
 
-        for dr, dc in DIRECTIONS:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] != '#':
-                heappush(heap, (cost + 1, nr, nc, path + [(nr, nc)]))
+    def neighbors(pos):
+        return [pos + step for step in grid.offsets4 if cells[pos + step] not in (PAD, WALL)]
 
-    return []
+    return bfs([start], neighbors, len(cells), targets=[end]).path(end)
 
 
-def part1():
-    grid, start, end = parse_input('my_input.txt')
+def part1(filename='my_input.txt'):
+    grid, start, end = parse_input(filename)
 
-    path = find_shortest_path(grid, start, end)
+    path = [grid.position(pos) for pos in find_shortest_path(grid, start, end)]
     min_savings = 100
     path_length = len(path)
     cheat_path_count = 0
+    report = progress(path_length)
 
     for i in range(path_length - 1):
-        print(f'Progress: {i * 100 // path_length}%', end='\r', flush=True)
+        report.update(i)
 
         for j in range(i + 1, path_length):
             (r1, c1), (r2, c2) = path[i], path[j]
@@ -62,22 +48,24 @@ def part1():
                 if savings >= min_savings:
                     cheat_path_count += 1
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     print(f'Answer: {cheat_path_count}')
+    return cheat_path_count
 
 
-def part2():
-    grid, start, end = parse_input('my_input.txt')
+def part2(filename='my_input.txt'):
+    grid, start, end = parse_input(filename)
 
-    path = find_shortest_path(grid, start, end)
+    path = [grid.position(pos) for pos in find_shortest_path(grid, start, end)]
     min_savings = 100
     max_cheat_distance = 20
     path_length = len(path)
     cheat_path_count = 0
+    report = progress(path_length)
 
     for i in range(path_length - 1):
-        print(f'Progress: {i * 100 // path_length}%', end='\r', flush=True)
+        report.update(i)
 
         for j in range(i + 1, path_length):
             (r1, c1), (r2, c2) = path[i], path[j]
@@ -88,9 +76,10 @@ def part2():
                 if savings >= min_savings:
                     cheat_path_count += 1
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     print(f'Answer: {cheat_path_count}')
+    return cheat_path_count
 
 
 if __name__ == '__main__':
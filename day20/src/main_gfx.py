@@ -1,10 +1,21 @@
+import sys
 from heapq import heappop, heappush
 from pathlib import Path
 
-from PIL import Image, ImageDraw, ImageFont
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.gfx import Raster, frame_sink
+from aoc.progress import progress
 
 DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
 
+# draw_grid colours, the walls are painted once and everything else is overlaid per frame
+COLORS = ('black', 'gray', 'white', 'cyan', 'red', 'blue')
+TRACK, WALL, PATH, SHORTCUT, START, END = range(len(COLORS))
+
+# one frame per cheat is around a million frames for the real input
+MAX_FRAMES = 2000
+
 
 def parse_input(filename):
     grid = list(map(list, Path(filename).read_text().strip().splitlines()))
@@ -62,53 +73,37 @@ def line_between(a, b):
     return line
 
 
-def draw_grid(grid, start, end, path, all_paths=[], pixel_size=5, text=None):
-    rows, cols = len(grid), len(grid[0])
-    img = Image.new('RGB', (cols * pixel_size, rows * pixel_size), 'black')
-    draw = ImageDraw.Draw(img)
+def grid_raster(grid, pixel_size=5):
+    import numpy as np
+
+    walls = np.array(grid) == '#'
+    return Raster(len(grid), len(grid[0]), COLORS, pixel_size).paint_mask(walls, WALL)
 
-    for r, row in enumerate(grid):
-        for c, cell in enumerate(row):
-            x0, y0 = c * pixel_size, r * pixel_size
-            x1, y1 = x0 + pixel_size, y0 + pixel_size
-            if cell == '#':
-                draw.rectangle([x0, y0, x1, y1], fill='gray')
-
-    for r, c in path:
-        x0, y0 = c * pixel_size, r * pixel_size
-        x1, y1 = x0 + pixel_size, y0 + pixel_size
-        draw.rectangle([x0, y0, x1, y1], fill='white')
-
-    for r, c in all_paths:
-        x0, y0 = c * pixel_size, r * pixel_size
-        x1, y1 = x0 + pixel_size, y0 + pixel_size
-        draw.rectangle([x0, y0, x1, y1], fill='cyan')
-
-    sx0, sy0 = start[1] * pixel_size, start[0] * pixel_size
-    sx1, sy1 = sx0 + pixel_size, sy0 + pixel_size
-    draw.rectangle([sx0, sy0, sx1, sy1], fill='red')
-
-    ex0, ey0 = end[1] * pixel_size, end[0] * pixel_size
-    ex1, ey1 = ex0 + pixel_size, ey0 + pixel_size
-    draw.rectangle([ex0, ey0, ex1, ey1], fill='blue')
+
+def draw_grid(raster, start, end, path, all_paths=[], text=None):
+    img = raster.render((path, PATH), (all_paths, SHORTCUT), ([start], START), ([end], END))
 
     if text:
+        from PIL import ImageDraw, ImageFont
+
         font = ImageFont.truetype('arialbd.ttf', 30)
-        draw.text((15, 5), text, fill='white', font=font)
+        ImageDraw.Draw(img).text((15, 5), text, fill='white', font=font)
 
     return img
 
 
-def part1():
-    grid, start, end = parse_input('my_input.txt')
+def part1(filename='my_input.txt', render=True):
+    grid, start, end = parse_input(filename)
 
     path = find_shortest_path(grid, start, end)
     min_savings = 100
     path_length = len(path)
     cheat_path_count = 0
 
+    report = progress(path_length)
+
     for i in range(path_length - 1):
-        print(f'Progress: {i * 100 // path_length}%', end='\r', flush=True)
+        report.update(i)
 
         for j in range(i + 1, path_length):
             (r1, c1), (r2, c2) = path[i], path[j]
@@ -120,13 +115,14 @@ def part1():
                 if savings >= min_savings:
                     cheat_path_count += 1
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     print(f'Answer: {cheat_path_count}')
+    return cheat_path_count
 
 
-def part2():
-    grid, start, end = parse_input('my_input.txt')
+def part2(filename='my_input.txt', render=True):
+    grid, start, end = parse_input(filename)
 
     path = find_shortest_path(grid, start, end)
     min_savings = 100
@@ -134,10 +130,14 @@ def part2():
     path_length = len(path)
     cheat_path_count = 0
 
-    images = [draw_grid(grid, start, end, path)]
+    raster = grid_raster(grid) if render else None
+    sink = frame_sink('shortcuts.gif', render, max_frames=MAX_FRAMES)
+    sink.add(lambda: draw_grid(raster, start, end, path))
+
+    report = progress(path_length)
 
     for i in range(path_length - 1):
-        print(f'Progress: {i * 100 // path_length}%', end='\r', flush=True)
+        report.update(i)
 
         for j in range(i + 1, path_length):
             (r1, c1), (r2, c2) = path[i], path[j]
@@ -148,26 +148,20 @@ def part2():
                 if savings >= min_savings:
                     cheat_path_count += 1
 
-                    path_cut = path[0:i] + path[j:-1]
-                    shortcut = line_between(path[i], path[j])
-
-                    images.append(
-                        draw_grid(grid, path[i], path[j], path_cut, all_paths=shortcut)
-                    )
+                    # the cut path and shortcut are only built for frames the sink keeps
+                    sink.add(lambda: draw_grid(
+                        raster, path[i], path[j], path[0:i] + path[j:-1], all_paths=line_between(path[i], path[j])
+                    ))
 
-    images[0].save(
-        'shortcuts.gif',
-        save_all=True,
-        append_images=images[1:],
-        duration=100,
-        loop=0,
-    )
+    sink.close()
 
-    print('\r\033[2K', end='\r')
+    report.close()
 
     print(f'Answer: {cheat_path_count}')
+    return cheat_path_count
 
 
 if __name__ == '__main__':
-    # part1()
-    part2()
+    render = '--headless' not in sys.argv
+    # part1(render=render)
+    part2(render=render)
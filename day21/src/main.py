@@ -54,20 +54,22 @@ def min_moves(code, depth, num_moves, dir_moves):
     return recurse(code, 0)
 
 
-def part1():
-    codes = Path('my_input.txt').read_text().strip().splitlines()
+def part1(filename='my_input.txt'):
+    codes = Path(filename).read_text().strip().splitlines()
     num_moves, dir_moves = gen_moves(NUM_KEYPAD), gen_moves(DIR_KEYPAD)
     total = sum(min_moves(c, 2, num_moves, dir_moves) * int(c[:-1]) for c in codes)
 
     print(f'Answer: {total}')
+    return total
 
 
-def part2():
-    codes = Path('my_input.txt').read_text().strip().splitlines()
+def part2(filename='my_input.txt'):
+    codes = Path(filename).read_text().strip().splitlines()
     num_moves, dir_moves = gen_moves(NUM_KEYPAD), gen_moves(DIR_KEYPAD)
     total = sum(min_moves(c, 25, num_moves, dir_moves) * int(c[:-1]) for c in codes)
 
     print(f'Answer: {total}')
+    return total
 
 
 if __name__ == '__main__':
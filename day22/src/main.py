@@ -1,15 +1,24 @@
+import sys
 from collections import defaultdict
 from itertools import pairwise
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.cache import cached_parser
+
 MASK_24BIT = 0xFFFFFF
 GENS = 2000
 SEQ_LEN = 4
 
 
-def part1():
-    data = Path('my_input.txt').read_text().strip().splitlines()
-    secrets = map(int, data)
+@cached_parser()
+def parse_input(filename):
+    return list(map(int, Path(filename).read_text().strip().splitlines()))
+
+
+def part1(filename='my_input.txt'):
+    secrets = parse_input(filename)
 
     secret_sum = 0
     for secret in secrets:
@@ -21,11 +30,11 @@ def part1():
         secret_sum += secret
 
     print("Answer:", secret_sum)
+    return secret_sum
 
 
-def part2():
-    data = Path('my_input.txt').read_text().strip().splitlines()
-    secrets = map(int, data)
+def part2(filename='my_input.txt'):
+    secrets = parse_input(filename)
 
     amounts = defaultdict(int)
     for secret in secrets:
@@ -44,7 +53,10 @@ def part2():
                 seen_sequences.add(sequence)
                 amounts[sequence] += price
 
-    print("Answer:", max(amounts.values()))
+    best_amount = max(amounts.values())
+
+    print("Answer:", best_amount)
+    return best_amount
 
 
 if __name__ == '__main__':
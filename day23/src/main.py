@@ -1,7 +1,14 @@
+import sys
 from collections import defaultdict
 from itertools import combinations
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoc.cache import cached_parser
+
+
+@cached_parser()
 def parse_input(filename):
     graph = defaultdict(set)
 
@@ -37,8 +44,8 @@ def find_cliques(graph):
 
     return cliques
 
-def part1():
-    graph = parse_input('my_input.txt')
+def part1(filename='my_input.txt'):
+    graph = parse_input(filename)
 
     cliques = find_cliques(graph)
     triplets = {
@@ -49,14 +56,18 @@ def part1():
     }
 
     print(f'Answer: {len(triplets)}')
+    return len(triplets)
 
-def part2():
-    graph = parse_input('my_input.txt')
+def part2(filename='my_input.txt'):
+    graph = parse_input(filename)
 
     cliques = find_cliques(graph)
     largest_clique = sorted(max(cliques, key=len))
 
-    print(f'Answer: {','.join(largest_clique)}')
+    result = ','.join(largest_clique)
+
+    print(f'Answer: {result}')
+    return result
 
 if __name__ == '__main__':
     part1()
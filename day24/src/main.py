@@ -1,6 +1,12 @@
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from aoc.cache import cached_parser
+
+
+@cached_parser()
 def parse_input(filename):
     section_inputs, section_gates = Path(filename).read_text().strip().split('\n\n')
 
@@ -40,15 +46,17 @@ def simulate(values, gates):
             remaining_gates.remove(gate)
 
 
-def part1():
-    values, gates = parse_input('my_input.txt')
+def part1(filename='my_input.txt'):
+    values, gates = parse_input(filename)
     simulate(values, gates)
     binary_number = ''.join(str(values[k]) for k in reversed(sorted((k for k in values if k.startswith('z')))))
-    print(f'Answer: {int(binary_number, 2)}')
+    result = int(binary_number, 2)
+    print(f'Answer: {result}')
+    return result
 
 
-def part2():
-    _, gates = parse_input('my_input.txt')
+def part2(filename='my_input.txt'):
+    _, gates = parse_input(filename)
 
     def out(s_op, s_in):
         for op, in1, in2, out in gates:
@@ -94,7 +102,10 @@ def part2():
         if prop_out not in carry_out_ins:
             swapped_outs.append(prop_out)
 
-    print(f'Answer: {','.join(map(str, sorted(swapped_outs)))}')
+    result = ','.join(map(str, sorted(swapped_outs)))
+
+    print(f'Answer: {result}')
+    return result
 
 
 if __name__ == '__main__':
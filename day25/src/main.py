@@ -1,7 +1,7 @@
 from pathlib import Path
 
-def part1():
-    data = Path('my_input.txt').read_text().strip().split("\n\n")
+def part1(filename='my_input.txt'):
+    data = Path(filename).read_text().strip().split("\n\n")
     locks, keys = [], []
 
     for schematic in data:
@@ -16,6 +16,7 @@ def part1():
     )
 
     print(f'Answer: {fitting_pairs_count}')
+    return fitting_pairs_count
 
 if __name__ == '__main__':
     part1()